@@ -0,0 +1,68 @@
+"""
+Tests for dedupe_glyphs() in generate-icon-font.py
+
+    python3 -m pytest scripts/__tests__
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from script_loader import load_icon_font_module
+
+icon_font = load_icon_font_module()
+
+
+@pytest.fixture(scope="module")
+def fonts():
+    """The plain and deduplicated fonts for --tier all."""
+    paths = icon_font.extract_paths("all")
+    glyphs = {}
+    cmap = {}
+    for codepoint, (name, svg_path) in icon_font.font_mappings("all").items():
+        if paths.get(svg_path):
+            glyphs[name.lower()] = icon_font.build_glyph(paths[svg_path])
+            cmap[codepoint] = name.lower()
+    plain = icon_font.build_font(glyphs, cmap)
+    deduped, shared, references = icon_font.dedupe_glyphs(glyphs)
+    return plain, icon_font.build_font(deduped, cmap), shared, references
+
+
+def decomposed(font, name):
+    """
+    A glyph's points with components resolved, one tuple of (x, y, on)
+    per contour. dedupe_glyphs() rotates shared contours to a canonical
+    start point, so each contour starts at its smallest point here too.
+    """
+    glyf = font["glyf"]
+    coordinates, ends, flags = glyf[name].getCoordinates(glyf)
+    contours = []
+    start = 0
+    for end in ends:
+        points = [
+            (x, y, flags[i] & 0x01)
+            for i, (x, y) in enumerate(coordinates[start:end + 1], start)
+        ]
+        first = points.index(min(points))
+        contours.append(tuple(points[first:] + points[:first]))
+        start = end + 1
+    return sorted(contours)
+
+
+def test_dedupe_shares_contours_across_tiers(fonts):
+    _, deduped, shared, references = fonts
+    assert shared > 0
+    assert references > shared
+    assert any(name.startswith("contour.") for name in deduped.getGlyphOrder())
+
+
+def test_deduped_glyphs_decompose_to_the_original_outlines(fonts):
+    plain, deduped, _, _ = fonts
+    names = sorted(plain.getBestCmap().values())
+    assert len(names) == len(icon_font.ICON_TIERS) * 6
+    for name in names:
+        assert decomposed(deduped, name) == decomposed(plain, name), name
+        assert deduped["hmtx"][name] == plain["hmtx"][name]
@@ -0,0 +1,160 @@
+"""
+Lightweight tracing for the asset generators.
+
+Set DENDROVIA_TRACE to record nested span timings and counters in Chrome
+trace-event JSON (open in https://ui.perfetto.dev or chrome://tracing):
+
+    DENDROVIA_TRACE=trace.json python3 generate-icon-font.py --tier all
+
+If DENDROVIA_TRACE names an existing directory, each process writes its
+own <script>-<pid>.json there instead, which suits build-assets.py
+running several generators in parallel. Timestamps are wall-clock based,
+so files from different processes line up when loaded together.
+
+Usage:
+
+    import asset_trace
+
+    with asset_trace.span("build_glyphs", tier=tier):
+        ...
+        asset_trace.count("glyphs_built")
+    asset_trace.count("bytes_written", len(data))
+
+When DENDROVIA_TRACE is unset, span() returns a shared no-op context
+manager and count() returns immediately; count in bulk rather than per
+item inside hot loops.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+
+TRACE_PATH = os.environ.get("DENDROVIA_TRACE")
+enabled = bool(TRACE_PATH)
+
+_events = []
+_counters = {}
+_lock = threading.Lock()
+_pid = os.getpid()
+
+# perf_counter resolution, shifted onto the wall clock
+_clock_offset = time.time() - time.perf_counter()
+
+
+def _now_us():
+    return (time.perf_counter() + _clock_offset) * 1e6
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = _now_us()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        _events.append({
+            "name": self.name,
+            "cat": "asset",
+            "ph": "X",
+            "ts": self.start,
+            "dur": end - self.start,
+            "pid": _pid,
+            "tid": threading.get_ident(),
+            "args": self.args,
+        })
+        return False
+
+    def set(self, **args):
+        """Attach arguments known only once the span is running."""
+        self.args.update(args)
+
+
+def span(name, **args):
+    """Context manager timing a (possibly nested) region of work."""
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def count(name, value=1):
+    """Add value to a running counter, recorded as a trace counter event."""
+    if not enabled:
+        return
+    with _lock:
+        total = _counters[name] = _counters.get(name, 0) + value
+    _events.append({
+        "name": name,
+        "cat": "asset",
+        "ph": "C",
+        "ts": _now_us(),
+        "pid": _pid,
+        "args": {name: total},
+    })
+
+
+def counters():
+    """Current counter totals (empty when tracing is off)."""
+    with _lock:
+        return dict(_counters)
+
+
+def output_path(path=TRACE_PATH):
+    if path and os.path.isdir(path):
+        script = os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0]
+        return os.path.join(path, f"{script}-{_pid}.json")
+    return path
+
+
+def write(path=None):
+    """Write the recorded events; called automatically at exit when enabled."""
+    path = output_path(path or TRACE_PATH)
+    if not path or not _events:
+        return None
+
+    process_name = os.path.basename(sys.argv[0] or "python")
+    trace = {
+        "traceEvents": [
+            {"name": "process_name", "ph": "M", "pid": _pid,
+             "args": {"name": process_name}},
+        ] + _events,
+        "displayTimeUnit": "ms",
+        "otherData": {"counters": counters()},
+    }
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(trace, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+if enabled:
+    atexit.register(write)
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Build all Dendrovia generated assets from one entry point.
+
+Declares the Python generators as tasks in a dependency graph:
+
+    iterm-palettes     workspace-launcher/generate-iterm-256.py
+    svg-extract:TIER   generate-icon-font.py --extract (per icon tier)
+    font:TIER          generate-icon-font.py, from the extracted paths
+    font:all           every tier in one font, from all extractions
+    fontforge:TIER     fontforge-generate.py (FontForge, if installed)
+    tile-windows       workspace-launcher/ghostty-window-grid.py
+
+Each task's key is a hash of its command and the contents of its input
+files (including outputs of the tasks it depends on). Outputs are stored
+content-addressed in a shared cache directory, so a task whose key was
+seen before is skipped if its outputs are intact, or restored from the
+cache without running. Independent tasks run in parallel.
+
+Usage:
+    python3 build-assets.py                 # iterm-palettes + fonts
+    python3 build-assets.py font:medium     # one task and its dependencies
+    python3 build-assets.py fontforge tile-windows
+    python3 build-assets.py --list
+    python3 build-assets.py --force -j 4
+
+Target groups: all (default), fonts, fontforge.
+
+To trace every generator, point DENDROVIA_TRACE at a directory; each
+task process then writes its own trace file there (see asset_trace.py).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+sys.path.insert(0, str(SCRIPT_DIR))
+from icon_tiers import ICON_TIERS, font_filename
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("DENDROVIA_ASSET_CACHE", Path.home() / ".cache" / "dendrovia" / "assets")
+)
+
+# Bump to invalidate every cached action
+CACHE_VERSION = 1
+
+
+class Task:
+    """
+    One build step.
+
+    command: argv relative to the project root; a leading "python3" runs
+    with this interpreter. inputs/outputs: paths relative to the project
+    root (outputs of dependencies belong in inputs too). Tasks with
+    always_run have side effects outside their outputs and never cache.
+    """
+
+    def __init__(self, name, command, inputs=(), outputs=(), deps=(), always_run=False):
+        self.name = name
+        self.command = list(command)
+        self.inputs = [str(p) for p in inputs]
+        self.outputs = [str(p) for p in outputs]
+        self.deps = list(deps)
+        self.always_run = always_run
+
+
+def rel(path):
+    return str(Path(path).relative_to(PROJECT_ROOT))
+
+
+def font_file(tier, fmt, directory="assets/fonts"):
+    return f"{directory}/{font_filename(tier, fmt)}"
+
+
+def icon_svgs(tier):
+    return sorted(rel(p) for p in (PROJECT_ROOT / "assets" / "icons" / tier).glob("*.svg"))
+
+
+def define_tasks(build_dir):
+    """All tasks, keyed by name. build_dir holds intermediate files."""
+    icon_font = "scripts/generate-icon-font.py"
+    fontforge_script = "scripts/fontforge-generate.py"
+    iterm_script = "scripts/workspace-launcher/generate-iterm-256.py"
+    # Imported by every generator
+    trace = "scripts/asset_trace.py"
+    # Imported by the icon font generators
+    tiers = "scripts/icon_tiers.py"
+    loader = "scripts/script_loader.py"
+    extracted = {tier: f"{build_dir}/svg/{tier}.json" for tier in ICON_TIERS}
+
+    tasks = [
+        Task(
+            "iterm-palettes",
+            ["python3", iterm_script, "--local-only"],
+            inputs=[iterm_script, trace],
+            outputs=["scripts/workspace-launcher/Dendrovia.plist"],
+        ),
+    ]
+
+    for tier in ICON_TIERS:
+        tasks.append(Task(
+            f"svg-extract:{tier}",
+            ["python3", icon_font, "--tier", tier, "--extract", extracted[tier]],
+            inputs=[icon_font, trace, tiers] + icon_svgs(tier),
+            outputs=[extracted[tier]],
+        ))
+        tasks.append(Task(
+            f"font:{tier}",
+            ["python3", icon_font, "--tier", tier, "--paths-json", extracted[tier],
+             "--out-dir", "assets/fonts"],
+            inputs=[icon_font, trace, tiers, extracted[tier]],
+            outputs=[font_file(tier, "ttf"), font_file(tier, "woff2")],
+            deps=[f"svg-extract:{tier}"],
+        ))
+
+        if shutil.which("fontforge"):
+            fontforge_command = ["fontforge", "-script", fontforge_script]
+        else:
+            # fontforge-generate.py falls back to fontTools on its own
+            fontforge_command = ["python3", fontforge_script]
+        tasks.append(Task(
+            f"fontforge:{tier}",
+            fontforge_command + ["--tier", tier, "--out-dir", "assets/fonts/fontforge"],
+            inputs=[fontforge_script, icon_font, trace, tiers, loader] + icon_svgs(tier),
+            outputs=[font_file(tier, "ttf", "assets/fonts/fontforge"),
+                     font_file(tier, "woff2", "assets/fonts/fontforge")],
+        ))
+
+    all_paths = []
+    for tier in ICON_TIERS:
+        all_paths += ["--paths-json", extracted[tier]]
+    tasks.append(Task(
+        "font:all",
+        ["python3", icon_font, "--tier", "all", *all_paths, "--out-dir", "assets/fonts"],
+        inputs=[icon_font, trace, tiers] + [extracted[tier] for tier in ICON_TIERS],
+        outputs=[font_file("all", "ttf"), font_file("all", "woff2")],
+        deps=[f"svg-extract:{tier}" for tier in ICON_TIERS],
+    ))
+
+    tasks.append(Task(
+        "tile-windows",
+        ["python3", "scripts/workspace-launcher/ghostty-window-grid.py"],
+        always_run=True,
+    ))
+
+    return {task.name: task for task in tasks}
+
+
+def target_groups(tasks):
+    fonts = [name for name in tasks if name.startswith("font:")]
+    return {
+        "all": ["iterm-palettes"] + fonts,
+        "fonts": fonts,
+        "fontforge": [name for name in tasks if name.startswith("fontforge:")],
+    }
+
+
+def resolve_targets(tasks, targets):
+    """Expand groups and add dependencies; returns names in dependency order."""
+    groups = target_groups(tasks)
+    wanted = []
+    for target in targets or ["all"]:
+        if target in groups:
+            wanted += groups[target]
+        elif target in tasks:
+            wanted.append(target)
+        else:
+            raise SystemExit(f"Unknown target: {target} (see --list)")
+
+    ordered = []
+    visiting = set()
+
+    def visit(name):
+        if name in ordered:
+            return
+        if name in visiting:
+            raise SystemExit(f"Dependency cycle at {name}")
+        visiting.add(name)
+        for dep in tasks[name].deps:
+            visit(dep)
+        visiting.discard(name)
+        ordered.append(name)
+
+    for name in wanted:
+        visit(name)
+    return ordered
+
+
+class ContentCache:
+    """
+    Content-addressed store shared by every task:
+
+        objects/ab/abcdef...     file contents by SHA-256
+        actions/<key>.json       task key -> {output path: SHA-256}
+        file-hashes.json         (size, mtime) -> SHA-256, to skip rehashing
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.actions = self.root / "actions"
+        self._hash_index_path = self.root / "file-hashes.json"
+        try:
+            self._hash_index = json.loads(self._hash_index_path.read_text())
+        except (OSError, ValueError):
+            self._hash_index = {}
+
+    def file_hash(self, path):
+        """SHA-256 of a file, or None if it does not exist."""
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        key = str(path.resolve())
+        cached = self._hash_index.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._hash_index[key] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def task_key(self, task):
+        h = hashlib.sha256()
+        h.update(json.dumps([CACHE_VERSION, task.name, task.command, task.outputs]).encode())
+        for path in sorted(task.inputs):
+            h.update(f"{path}\0{self.file_hash(PROJECT_ROOT / path)}\0".encode())
+        return h.hexdigest()
+
+    def object_path(self, digest):
+        return self.objects / digest[:2] / digest
+
+    def lookup(self, key):
+        try:
+            return json.loads((self.actions / f"{key}.json").read_text())
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key, outputs):
+        """Copy outputs into the object store and record the action."""
+        recorded = {}
+        for path in outputs:
+            digest = self.file_hash(PROJECT_ROOT / path)
+            if digest is None:
+                raise RuntimeError(f"declared output was not written: {path}")
+            obj = self.object_path(digest)
+            if not obj.exists():
+                obj.parent.mkdir(parents=True, exist_ok=True)
+                # Parallel tasks can produce identical outputs, so every
+                # copy needs its own temporary file
+                fd, tmp = tempfile.mkstemp(dir=obj.parent, prefix=f".{digest}.")
+                os.close(fd)
+                try:
+                    shutil.copyfile(PROJECT_ROOT / path, tmp)
+                    os.replace(tmp, obj)
+                except BaseException:
+                    os.unlink(tmp)
+                    raise
+            recorded[path] = digest
+        self.actions.mkdir(parents=True, exist_ok=True)
+        (self.actions / f"{key}.json").write_text(json.dumps(recorded, sort_keys=True))
+
+    def outputs_intact(self, recorded):
+        return all(
+            self.file_hash(PROJECT_ROOT / path) == digest
+            for path, digest in recorded.items()
+        )
+
+    def restore(self, recorded):
+        """Restore outputs from the object store; False if an object is missing."""
+        if not all(self.object_path(digest).exists() for digest in recorded.values()):
+            return False
+        for path, digest in recorded.items():
+            target = PROJECT_ROOT / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(self.object_path(digest), target)
+        return True
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self._hash_index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._hash_index))
+        os.replace(tmp, self._hash_index_path)
+
+
+def source_date_epoch():
+    """Pin generator timestamps to the last commit for reproducible outputs."""
+    if "SOURCE_DATE_EPOCH" in os.environ:
+        return os.environ["SOURCE_DATE_EPOCH"]
+    try:
+        result = subprocess.run(
+            ["git", "log", "-1", "--format=%ct"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=10,
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return "0"
+
+
+def run_command(task, env):
+    argv = list(task.command)
+    if argv[0] == "python3":
+        argv[0] = sys.executable
+    return subprocess.run(argv, cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+
+
+def execute(task, cache, force, env, dry_run):
+    """Bring one task up to date; returns (status, seconds, detail)."""
+    start = time.perf_counter()
+
+    if task.always_run:
+        key = recorded = None
+    else:
+        key = cache.task_key(task)
+        recorded = None if force else cache.lookup(key)
+
+    if recorded is not None:
+        if cache.outputs_intact(recorded):
+            return "up to date", time.perf_counter() - start, ""
+        if not dry_run and cache.restore(recorded):
+            return "restored", time.perf_counter() - start, ""
+
+    if dry_run:
+        return "would run", 0.0, ""
+
+    for path in task.outputs:
+        (PROJECT_ROOT / path).parent.mkdir(parents=True, exist_ok=True)
+
+    result = run_command(task, env)
+    if result.returncode != 0:
+        output = (result.stdout + result.stderr).strip().splitlines()
+        return "failed", time.perf_counter() - start, "\n".join(output[-15:])
+
+    if key is not None:
+        cache.store(key, task.outputs)
+    return "ran", time.perf_counter() - start, ""
+
+
+STATUS_ICONS = {
+    "ran": "✅",
+    "restored": "♻️ ",
+    "up to date": "⏭️ ",
+    "would run": "🔸",
+    "failed": "❌",
+    "skipped": "⚠️ ",
+}
+
+
+def build(tasks, order, cache, jobs, force=False, dry_run=False):
+    """Run tasks in parallel as their dependencies finish; returns failures."""
+    env = dict(os.environ, SOURCE_DATE_EPOCH=source_date_epoch())
+    pending = set(order)
+    done = set()
+    failed = set()
+    running = {}
+
+    def report(name, status, seconds, detail=""):
+        print(f"  {STATUS_ICONS[status]} {name:24} {status:11} {seconds:6.2f}s")
+        if detail:
+            for line in detail.splitlines():
+                print(f"      {line}")
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for name in [n for n in order if n in pending]:
+                deps = tasks[name].deps
+                if any(dep in failed for dep in deps):
+                    pending.discard(name)
+                    failed.add(name)
+                    report(name, "skipped", 0.0, "a dependency failed")
+                elif all(dep in done for dep in deps):
+                    pending.discard(name)
+                    running[pool.submit(execute, tasks[name], cache, force, env, dry_run)] = name
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    status, seconds, detail = future.result()
+                except Exception as e:
+                    status, seconds, detail = "failed", 0.0, str(e)
+                report(name, status, seconds, detail)
+                (failed if status == "failed" else done).add(name)
+
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build Dendrovia generated assets")
+    parser.add_argument("targets", nargs="*", help="task names or groups (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR))
+    parser.add_argument("--force", action="store_true", help="ignore cached results")
+    parser.add_argument("--dry-run", action="store_true", help="show what would run")
+    parser.add_argument("--list", action="store_true", help="list tasks and groups")
+    args = parser.parse_args()
+
+    cache = ContentCache(args.cache_dir)
+    build_dir = rel(PROJECT_ROOT / ".cache" / "build-assets")
+    tasks = define_tasks(build_dir)
+
+    if args.list:
+        for name, task in tasks.items():
+            deps = f" <- {', '.join(task.deps)}" if task.deps else ""
+            print(f"  {name}{deps}")
+        print("\nGroups:")
+        for group, members in target_groups(tasks).items():
+            print(f"  {group}: {' '.join(members)}")
+        return 0
+
+    order = resolve_targets(tasks, args.targets)
+
+    print(f"🏗️  Building {len(order)} tasks with {args.jobs} jobs (cache: {cache.root})\n")
+    start = time.perf_counter()
+    failed = build(tasks, order, cache, args.jobs, args.force, args.dry_run)
+    cache.save()
+
+    print(f"\n{'❌' if failed else '🎉'} {len(order) - len(failed)}/{len(order)} tasks ok"
+          f" in {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Benchmark and size/quality gate for the Dendrovia icon font build.
+
+Times each stage of generate-icon-font.py per icon tier:
+    extract    - SVG -> path data (extract_svg_path)
+    glyphs     - path data -> TrueType outlines (build_glyph)
+    dedupe     - shared contours -> component glyphs (dedupe_glyphs)
+    ttf/woff2  - font serialization (serialize_font)
+
+and records output sizes, point counts and glyph bounding boxes. Sizes
+cover both the plain font (ttf, woff2) and the font create_font()
+actually writes, the smaller of the plain and deduplicated variants
+(shipped_ttf, shipped_woff2).
+
+Usage:
+    python3 font-build-bench.py                      # print a report
+    python3 font-build-bench.py --write-baseline     # record baseline JSON
+    python3 font-build-bench.py --compare            # fail on regressions
+    python3 font-build-bench.py --compare --timings  # ... including timings
+
+Compare mode exits 1 when a size or point count grows by more than
+--threshold or a glyph bounding box drifts by more than --bbox-tolerance
+font units. Timings depend on the machine, so they are only recorded in
+the baseline and gated (--time-threshold) with --timings; the committed
+baseline holds sizes, points and bounding boxes only.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+DEFAULT_BASELINE = PROJECT_ROOT / "assets" / "fonts" / "font-bench-baseline.json"
+
+sys.path.insert(0, str(SCRIPT_DIR))
+from script_loader import load_icon_font_module
+
+BASELINE_VERSION = 1
+
+
+def best_of(repeat, fn):
+    """Run fn `repeat` times; return (fastest seconds, last result)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def glyph_metrics(glyph, glyf_table):
+    """Point count and bounding box of a TrueType glyph."""
+    glyph.recalcBounds(glyf_table)
+    if glyph.numberOfContours == 0:
+        return {"points": 0, "contours": 0, "bbox": None}
+    coords, _, _ = glyph.getCoordinates(glyf_table)
+    return {
+        "points": len(coords),
+        "contours": glyph.numberOfContours,
+        "bbox": [glyph.xMin, glyph.yMin, glyph.xMax, glyph.yMax],
+    }
+
+
+def bench_tier(icon_font, tier, repeat):
+    """Benchmark one tier; returns its baseline record."""
+    svg_files = {}
+    for codepoint, (name, svg_path) in icon_font.tier_mappings(tier).items():
+        svg_file = PROJECT_ROOT / svg_path
+        if svg_file.exists():
+            svg_files[codepoint] = (name.lower(), svg_file)
+
+    extract_time, path_data = best_of(repeat, lambda: {
+        name: icon_font.extract_svg_path(svg_file)
+        for name, svg_file in svg_files.values()
+    })
+
+    glyph_time, glyphs = best_of(repeat, lambda: {
+        name: icon_font.build_glyph(data)
+        for name, data in path_data.items() if data
+    })
+
+    cmap = {
+        codepoint: name
+        for codepoint, (name, _) in svg_files.items() if name in glyphs
+    }
+    font = icon_font.build_font(glyphs, cmap)
+
+    dedupe_time, (deduped, shared, references) = best_of(
+        repeat, lambda: icon_font.dedupe_glyphs(glyphs)
+    )
+    fonts = [font]
+    if shared:
+        fonts.append(icon_font.build_font(deduped, cmap))
+
+    ttf_time, ttf_bytes = best_of(repeat, lambda: icon_font.serialize_font(font))
+    woff2_time, woff2_bytes = best_of(
+        repeat, lambda: icon_font.serialize_font(font, "woff2")
+    )
+
+    shipped = {}
+    for fmt in ("ttf", "woff2"):
+        smallest, data = icon_font.serialize_smallest(fonts, fmt)
+        shipped[fmt] = len(data[smallest])
+
+    glyf = font["glyf"]
+    per_glyph = {name: glyph_metrics(glyf[name], glyf) for name in glyphs}
+
+    return {
+        "glyph_count": len(glyphs),
+        "points": sum(m["points"] for m in per_glyph.values()),
+        "shared_contours": shared,
+        "component_references": references,
+        "timings": {
+            "extract": extract_time,
+            "glyphs": glyph_time,
+            "dedupe": dedupe_time,
+            "ttf": ttf_time,
+            "woff2": woff2_time,
+        },
+        "sizes": {
+            "ttf": len(ttf_bytes),
+            "woff2": len(woff2_bytes),
+            "shipped_ttf": shipped["ttf"],
+            "shipped_woff2": shipped["woff2"],
+        },
+        "glyphs": per_glyph,
+    }
+
+
+def run_benchmark(icon_font, tiers, repeat):
+    return {
+        "version": BASELINE_VERSION,
+        "repeat": repeat,
+        "tiers": {tier: bench_tier(icon_font, tier, repeat) for tier in tiers},
+    }
+
+
+def grew(current, previous, threshold):
+    """True when current exceeds previous by more than the relative threshold."""
+    if previous == 0:
+        return current > 0
+    return (current - previous) / previous > threshold
+
+
+def compare_results(current, baseline, threshold, time_threshold, bbox_tolerance):
+    """
+    Return a list of human-readable regression messages. Timings are
+    only compared when time_threshold is not None.
+    """
+    regressions = []
+
+    for tier, now in current["tiers"].items():
+        before = baseline.get("tiers", {}).get(tier)
+        if before is None:
+            continue
+
+        for fmt, size in now["sizes"].items():
+            old = before["sizes"].get(fmt)
+            if old is not None and grew(size, old, threshold):
+                regressions.append(f"{tier}: {fmt} size {old} -> {size} bytes")
+
+        if grew(now["points"], before["points"], threshold):
+            regressions.append(
+                f"{tier}: point count {before['points']} -> {now['points']}"
+            )
+
+        timings = before.get("timings", {}) if time_threshold is not None else {}
+        for stage, seconds in now["timings"].items():
+            old = timings.get(stage)
+            if old is not None and grew(seconds, old, time_threshold):
+                regressions.append(
+                    f"{tier}: {stage} {old * 1000:.2f}ms -> {seconds * 1000:.2f}ms"
+                )
+
+        for name, metrics in now["glyphs"].items():
+            old = before["glyphs"].get(name)
+            if old is None:
+                continue
+            if (old["bbox"] is None) != (metrics["bbox"] is None):
+                regressions.append(f"{tier}/{name}: outline appeared or vanished")
+                continue
+            if old["bbox"] is None:
+                continue
+            drift = max(abs(a - b) for a, b in zip(metrics["bbox"], old["bbox"]))
+            if drift > bbox_tolerance:
+                regressions.append(
+                    f"{tier}/{name}: bbox {old['bbox']} -> {metrics['bbox']}"
+                )
+
+        missing = set(before["glyphs"]) - set(now["glyphs"])
+        for name in sorted(missing):
+            regressions.append(f"{tier}/{name}: glyph missing")
+
+    return regressions
+
+
+def print_report(results):
+    print(f"{'tier':12} {'glyphs':>6} {'points':>7} {'shared':>6} {'ttf':>8} {'woff2':>8}"
+          f" {'shipped':>15} {'extract':>9} {'glyphs':>9} {'dedupe':>9}"
+          f" {'ttf':>9} {'woff2':>9}")
+    for tier, record in results["tiers"].items():
+        t = record["timings"]
+        s = record["sizes"]
+        shipped = f"{s['shipped_ttf']}/{s['shipped_woff2']}"
+        print(f"{tier:12} {record['glyph_count']:>6} {record['points']:>7}"
+              f" {record['shared_contours']:>6} {s['ttf']:>8} {s['woff2']:>8} {shipped:>15}"
+              f" {t['extract'] * 1000:>7.2f}ms {t['glyphs'] * 1000:>7.2f}ms"
+              f" {t['dedupe'] * 1000:>7.2f}ms"
+              f" {t['ttf'] * 1000:>7.2f}ms {t['woff2'] * 1000:>7.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the icon font build")
+    parser.add_argument("--tier", action="append",
+                        help="tier to benchmark (repeatable, default: all)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="runs per stage; the fastest is recorded")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.05,
+                        help="allowed relative growth of sizes and point counts")
+    parser.add_argument("--timings", action="store_true",
+                        help="record timings in the baseline and gate on them")
+    parser.add_argument("--time-threshold", type=float, default=0.5,
+                        help="allowed relative slowdown of each stage (with --timings)")
+    parser.add_argument("--bbox-tolerance", type=float, default=2,
+                        help="allowed bounding-box drift in font units")
+    args = parser.parse_args()
+
+    icon_font = load_icon_font_module()
+    tiers = args.tier or list(icon_font.ICON_TIERS)
+    results = run_benchmark(icon_font, tiers, args.repeat)
+    print_report(results)
+
+    baseline_path = Path(args.baseline)
+
+    if args.write_baseline:
+        recorded = json.loads(json.dumps(results))
+        if not args.timings:
+            recorded.pop("repeat")
+            for record in recorded["tiers"].values():
+                record.pop("timings")
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(recorded, indent=2, sort_keys=True) + "\n")
+        print(f"\nWrote baseline: {baseline_path}")
+
+    if args.compare:
+        if not baseline_path.exists():
+            print(f"\nNo baseline at {baseline_path}; run with --write-baseline")
+            return 1
+        baseline = json.loads(baseline_path.read_text())
+        if baseline.get("version") != BASELINE_VERSION:
+            print(f"\nBaseline version {baseline.get('version')} is not "
+                  f"{BASELINE_VERSION}; re-record it with --write-baseline")
+            return 1
+
+        regressions = compare_results(
+            results, baseline,
+            args.threshold, args.time_threshold if args.timings else None,
+            args.bbox_tolerance,
+        )
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {baseline_path}:")
+            for message in regressions:
+                print(f"  - {message}")
+            return 1
+        print(f"\nNo regressions against {baseline_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
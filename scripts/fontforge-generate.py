@@ -2,28 +2,60 @@
 """
 Generate Dendrovia icon font using FontForge.
 
-This script requires FontForge Python bindings.
+This script requires FontForge Python bindings. Without them it falls
+back to the pure fontTools builder in generate-icon-font.py.
 
 Install:
     brew install fontforge
 
 Usage:
-    fontforge -script fontforge-generate.py
+    fontforge -script fontforge-generate.py [--tier medium]
+    fontforge -script fontforge-generate.py --worker
+
+Worker mode keeps one FontForge process alive and reads build jobs from
+stdin, one JSON object per line:
+
+    {"id": 1, "tier": "medium", "formats": ["ttf", "woff2"],
+     "codepoints": {"E000": "chronos", "E001": "imaginarium"},
+     "output_dir": "assets/fonts"}
+
+Every key except "tier" is optional. Codepoint keys are hex ("E000",
+"0xE000") or decimal ("57344") and must be in the Private Use Area.
+Each job is answered with one JSON line on stdout ({"id": 1, "ok": true,
+"outputs": [...], ...}); progress output goes to stderr. Imported
+outlines are cached per SVG file, so they are reused across formats,
+tiers and jobs. A {"cmd": "quit"} line or EOF stops the worker.
+
+Set DENDROVIA_TRACE=trace.json to record a timing trace (see asset_trace.py).
 """
 
 try:
     import fontforge
 except ImportError:
-    print("❌ FontForge Python module not found!")
-    print("   Install with: brew install fontforge")
-    exit(1)
+    fontforge = None
 
+import argparse
+import contextlib
+import copy
+import json
 import os
+import sys
+import time
 
 # Get script directory
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(script_dir)
 
+# fontforge -script does not put the script's directory on sys.path
+sys.path.insert(0, script_dir)
+import asset_trace
+from icon_tiers import DEFAULT_TIER, ICON_TIERS, font_filename
+from script_loader import load_icon_font_module
+
+FORMATS = ("ttf", "woff", "woff2")
+DEFAULT_FORMATS = ("ttf", "woff2")
+DEFAULT_OUTPUT_DIR = os.path.join(project_root, "assets", "fonts")
+
 # Icon mappings
 icons = {
     0xE000: ("chronos", "CHRONOS"),
@@ -34,75 +66,285 @@ icons = {
     0xE005: ("operatus", "OPERATUS"),
 }
 
-print("🎨 Generating Dendrovia custom icon font with FontForge...\n")
+# (svg path, mtime) -> centered outline, shared by every job in a process
+_outline_cache = {}
+
+
+def svg_path_for(tier, filename):
+    return os.path.join(project_root, "assets", "icons", tier, f"{filename}.svg")
+
+
+def output_path_for(output_dir, tier, fmt):
+    return os.path.join(output_dir, font_filename(tier, fmt))
+
+
+def parse_codepoints(mapping):
+    """
+    Parse a job's codepoint map. Keys are hex ("E000", "0xE000", "U+E000"),
+    decimal when all digits ("57344"), or ints; every codepoint must be in
+    the Private Use Area (U+E000-U+F8FF).
+    """
+    if not mapping:
+        return {codepoint: filename for codepoint, (filename, _) in icons.items()}
+    parsed = {}
+    for key, filename in mapping.items():
+        codepoint = key
+        if isinstance(key, str):
+            text = key.strip()
+            if text.isdigit():
+                codepoint = int(text)
+            else:
+                if text.lower().startswith(("0x", "u+")):
+                    text = text[2:]
+                try:
+                    codepoint = int(text, 16)
+                except ValueError:
+                    raise ValueError(f"invalid codepoint: {key!r}") from None
+        if not isinstance(codepoint, int) or not 0xE000 <= codepoint <= 0xF8FF:
+            raise ValueError(f"codepoint {key!r} is outside the Private Use Area")
+        parsed[codepoint] = filename
+    return parsed
 
-# Create new font
-font = fontforge.font()
-font.familyname = "Dendrovia Icons"
-font.fullname = "Dendrovia Icons Regular"
-font.fontname = "DendroviaIcons-Regular"
-font.encoding = "UnicodeFull"
-font.version = "1.0"
-font.copyright = "Dendrovia Project"
-font.em = 1000  # Units per em
 
-print(f"📝 Font: {font.fullname}")
-print(f"   Family: {font.familyname}")
-print(f"   EM: {font.em}\n")
+def _cache_key(svg_path):
+    return (svg_path, os.stat(svg_path).st_mtime_ns)
 
-# Import SVG icons
-for codepoint, (filename, name) in icons.items():
-    svg_path = os.path.join(project_root, "assets", "icons", f"{filename}.svg")
 
-    if not os.path.exists(svg_path):
-        print(f"  ⚠️  {name:12} - File not found: {svg_path}")
-        continue
+# ─── FontForge builder ──────────────────────────────────────────────────────
 
-    try:
-        # Create glyph at codepoint
-        glyph = font.createChar(codepoint, filename)
+def new_fontforge_font():
+    # Create new font
+    font = fontforge.font()
+    font.familyname = "Dendrovia Icons"
+    font.fullname = "Dendrovia Icons Regular"
+    font.fontname = "DendroviaIcons-Regular"
+    font.encoding = "UnicodeFull"
+    font.version = "1.0"
+    font.copyright = "Dendrovia Project"
+    font.em = 1000  # Units per em
+    return font
 
-        # Import SVG
-        glyph.importOutlines(svg_path, scale=True)
 
-        # Set glyph width (make it monospaced)
+def import_outline(glyph, svg_path):
+    """Import and center an SVG into glyph, reusing a cached outline if any."""
+    key = _cache_key(svg_path)
+    cached = _outline_cache.get(key)
+    if cached is not None:
+        glyph.foreground = cached
         glyph.width = 1000
+        return True
+
+    # Import SVG
+    glyph.importOutlines(svg_path, scale=True)
+
+    # Set glyph width (make it monospaced)
+    glyph.width = 1000
+
+    # Center the glyph
+    bbox = glyph.boundingBox()
+    if bbox[2] - bbox[0] > 0:  # Has content
+        # Calculate centering offset
+        glyph_width = bbox[2] - bbox[0]
+        offset_x = (1000 - glyph_width) / 2 - bbox[0]
+        glyph.transform((1, 0, 0, 1, offset_x, 0))
+
+    _outline_cache[key] = glyph.foreground
+    return False
+
+
+def build_with_fontforge(tier, codepoints, formats, output_dir):
+    font = new_fontforge_font()
+    reused = 0
+    glyph_count = 0
+
+    print(f"📝 Font: {font.fullname} ({tier})")
+
+    # Import SVG icons
+    for codepoint, filename in codepoints.items():
+        svg_path = svg_path_for(tier, filename)
+
+        if not os.path.exists(svg_path):
+            print(f"  ⚠️  {filename:12} - File not found: {svg_path}")
+            continue
+
+        try:
+            # Create glyph at codepoint
+            with asset_trace.span("import_outline", glyph=filename) as glyph_span:
+                glyph = font.createChar(codepoint, filename)
+                cached = import_outline(glyph, svg_path)
+                glyph_span.set(cached=cached)
+            reused += cached
+            glyph_count += 1
+            print(f"  ✅ U+{codepoint:04X} {filename:12} <- {tier}/{filename}.svg")
+
+        except Exception as e:
+            print(f"  ❌ {filename:12} - Error: {e}")
+
+    # Generate font files; every format comes from the same imported glyphs
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = []
+    for fmt in formats:
+        path = output_path_for(output_dir, tier, fmt)
+        with asset_trace.span("generate", format=fmt):
+            font.generate(path)
+        asset_trace.count("bytes_written", os.path.getsize(path))
+        outputs.append(path)
+        print(f"  ✅ {path}")
+
+    font.close()
+    asset_trace.count("glyphs_built", glyph_count)
+    return outputs, glyph_count, reused
+
+
+# ─── fontTools fallback ─────────────────────────────────────────────────────
+
+def build_with_fonttools(tier, codepoints, formats, output_dir):
+    icon_font = load_icon_font_module()
+    glyphs = {}
+    cmap = {}
+    reused = 0
+
+    print(f"📝 Font: Dendrovia Icons Regular ({tier}, fontTools)")
+
+    for codepoint, filename in codepoints.items():
+        svg_path = svg_path_for(tier, filename)
+
+        if not os.path.exists(svg_path):
+            print(f"  ⚠️  {filename:12} - File not found: {svg_path}")
+            continue
+
+        try:
+            key = _cache_key(svg_path)
+            cached = _outline_cache.get(key)
+            if cached is None:
+                with asset_trace.span("build_glyph", glyph=filename):
+                    path_data = icon_font.extract_svg_path(svg_path)
+                    if not path_data:
+                        print(f"  ⚠️  {filename:12} - No paths found in SVG")
+                        continue
+                    cached = _outline_cache[key] = icon_font.build_glyph(path_data)
+            else:
+                reused += 1
+            # fontTools compiles glyphs in place; keep the cached copy pristine
+            glyphs[filename] = copy.deepcopy(cached)
+            cmap[codepoint] = filename
+            print(f"  ✅ U+{codepoint:04X} {filename:12} <- {tier}/{filename}.svg")
+
+        except Exception as e:
+            print(f"  ❌ {filename:12} - Error: {e}")
+
+    asset_trace.count("glyphs_built", len(glyphs))
+    with asset_trace.span("build_font"):
+        font = icon_font.build_font(glyphs, cmap)
+
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = []
+    for fmt in formats:
+        path = output_path_for(output_dir, tier, fmt)
+        with asset_trace.span("serialize", format=fmt):
+            data = icon_font.serialize_font(font, None if fmt == "ttf" else fmt)
+        with open(path, "wb") as f:
+            f.write(data)
+        asset_trace.count("bytes_written", len(data))
+        outputs.append(path)
+        print(f"  ✅ {path}")
+
+    return outputs, len(glyphs), reused
+
+
+# ─── Jobs ───────────────────────────────────────────────────────────────────
+
+def run_job(job):
+    """Run one build job dict and return its JSON-serializable result."""
+    tier = job.get("tier", DEFAULT_TIER)
+    if tier not in ICON_TIERS:
+        raise ValueError(f"unknown tier: {tier}")
+
+    codepoints = parse_codepoints(job.get("codepoints"))
+    formats = job.get("formats") or DEFAULT_FORMATS
+    if not isinstance(formats, (list, tuple)) or not set(formats) <= set(FORMATS):
+        raise ValueError(f"formats must be a list of {', '.join(FORMATS)}: {formats!r}")
+    formats = tuple(formats)
+    output_dir = job.get("output_dir") or DEFAULT_OUTPUT_DIR
+    if not os.path.isabs(output_dir):
+        output_dir = os.path.join(project_root, output_dir)
+
+    builder = build_with_fontforge if fontforge is not None else build_with_fonttools
+    backend = "fontforge" if fontforge is not None else "fonttools"
+
+    start = time.perf_counter()
+    with asset_trace.span("run_job", tier=tier, backend=backend, id=job.get("id")):
+        outputs, glyph_count, reused = builder(tier, codepoints, formats, output_dir)
+
+    return {
+        "id": job.get("id"),
+        "ok": True,
+        "backend": backend,
+        "tier": tier,
+        "glyphs": glyph_count,
+        "reused_outlines": reused,
+        "outputs": outputs,
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+
+
+def run_worker(stdin=sys.stdin, stdout=sys.stdout):
+    """Serve JSON build jobs from stdin until EOF or {"cmd": "quit"}."""
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        job = {}
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict):
+                raise ValueError("job must be a JSON object")
+            if job.get("cmd") == "quit":
+                break
+            # Keep stdout reserved for the JSON protocol
+            with contextlib.redirect_stdout(sys.stderr):
+                result = run_job(job)
+        except Exception as e:
+            job_id = job.get("id") if isinstance(job, dict) else None
+            result = {"id": job_id, "ok": False, "error": str(e)}
+
+        stdout.write(json.dumps(result) + "\n")
+        stdout.flush()
+
 
-        # Center the glyph
-        bbox = glyph.boundingBox()
-        if bbox[2] - bbox[0] > 0:  # Has content
-            # Calculate centering offset
-            glyph_width = bbox[2] - bbox[0]
-            offset_x = (1000 - glyph_width) / 2 - bbox[0]
-            glyph.transform((1, 0, 0, 1, offset_x, 0))
+def main():
+    parser = argparse.ArgumentParser(description="Generate the Dendrovia icon font")
+    parser.add_argument("--tier", choices=ICON_TIERS, default=DEFAULT_TIER)
+    parser.add_argument("--out-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--worker", action="store_true",
+                        help="serve JSON build jobs from stdin")
+    args = parser.parse_args()
 
-        print(f"  ✅ U+{codepoint:04X} {name:12} <- {filename}.svg")
+    if args.worker:
+        run_worker()
+        return 0
 
-    except Exception as e:
-        print(f"  ❌ {name:12} - Error: {e}")
+    if fontforge is None:
+        print("⚠️  FontForge Python module not found, using fontTools instead")
+        print("   Install with: brew install fontforge\n")
 
-# Generate font files
-output_dir = os.path.join(project_root, "assets", "fonts")
-os.makedirs(output_dir, exist_ok=True)
+    print("🎨 Generating Dendrovia custom icon font...\n")
+    print(f"📦 Generating font files in {args.out_dir}...\n")
 
-print(f"\n📦 Generating font files in {output_dir}...\n")
+    result = run_job({"tier": args.tier, "output_dir": args.out_dir})
 
-# Generate TrueType
-ttf_path = os.path.join(output_dir, "dendrovia-icons.ttf")
-font.generate(ttf_path)
-print(f"  ✅ {ttf_path}")
+    print("\n🎉 Font generation complete!")
+    print("\n📋 Unicode mappings:")
+    for codepoint, (filename, name) in icons.items():
+        print(f"   U+{codepoint:04X}  {chr(codepoint)}  {name}")
 
-# Generate WOFF2 (for web)
-woff2_path = os.path.join(output_dir, "dendrovia-icons.woff2")
-font.generate(woff2_path)
-print(f"  ✅ {woff2_path}")
+    print("\n💡 Next steps:")
+    print(f"   1. Install font: cp {result['outputs'][0]} ~/Library/Fonts/")
+    print("   2. Restart terminal")
+    print("   3. Update launcher to use \\uE000-\\uE005 characters")
+    return 0
 
-print("\n🎉 Font generation complete!")
-print("\n📋 Unicode mappings:")
-for codepoint, (filename, name) in icons.items():
-    print(f"   U+{codepoint:04X}  {chr(codepoint)}  {name}")
 
-print("\n💡 Next steps:")
-print("   1. Install font: cp assets/fonts/dendrovia-icons.ttf ~/Library/Fonts/")
-print("   2. Restart terminal")
-print("   3. Update launcher to use \\uE000-\\uE005 characters")
+if __name__ == "__main__":
+    sys.exit(main())
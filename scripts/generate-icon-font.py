@@ -5,103 +5,221 @@ Generate Dendrovia custom icon font from SVG files.
 Converts 6 SVG icons into a TrueType font with glyphs mapped to
 Private Use Area (PUA) Unicode characters U+E000-U+E005.
 
+Each icon tier (simple/, medium/, detailed/, emoji-grade/) can be
+built on its own; outlines are converted with fontTools, so FontForge
+is only needed for fontforge-generate.py.
+
 Requirements:
-    pip3 install fonttools
+    pip3 install fonttools brotli  # brotli is needed for WOFF2
     brew install fontforge  # Optional, for viewing
 
+Set DENDROVIA_TRACE=trace.json to record a timing trace (see asset_trace.py).
+
 Usage:
     python3 generate-icon-font.py
+    python3 generate-icon-font.py --tier medium --out-dir assets/fonts
+    python3 generate-icon-font.py --tier all   # every tier, U+E000-U+E3FF
+
+    # Split extraction from the font build (used by build-assets.py)
+    python3 generate-icon-font.py --tier medium --extract medium.json
+    python3 generate-icon-font.py --tier medium --paths-json medium.json
 """
 
 from fontTools.fontBuilder import FontBuilder
-from fontTools.pens.t2CharStringPen import T2CharStringPen
+from fontTools.misc.transform import Identity, Transform
+from fontTools.pens.cu2quPen import Cu2QuPen
 from fontTools.pens.svgPathPen import SVGPathPen
+from fontTools.pens.transformPen import TransformPen
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.svgLib.path import parse_path
+from fontTools.ttLib.tables import ttProgram
+from fontTools.ttLib.tables._g_l_y_f import Glyph, GlyphComponent, GlyphCoordinates
 import xml.etree.ElementTree as ET
+from array import array
+from collections import defaultdict
+from io import BytesIO
+import hashlib
+import json
+import math
 from pathlib import Path
+import argparse
 import re
-
-# Icon mappings to Private Use Area
-ICON_MAPPINGS = {
-    0xE000: ("CHRONOS", "assets/icons/chronos.svg"),
-    0xE001: ("IMAGINARIUM", "assets/icons/imaginarium.svg"),
-    0xE002: ("ARCHITECTUS", "assets/icons/architectus.svg"),
-    0xE003: ("LUDUS", "assets/icons/ludus.svg"),
-    0xE004: ("OCULUS", "assets/icons/oculus.svg"),
-    0xE005: ("OPERATUS", "assets/icons/operatus.svg"),
+import sys
+
+# Also loaded by file path from other scripts, so add this directory itself
+script_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(script_dir))
+import asset_trace
+from icon_tiers import DEFAULT_TIER, ICON_TIERS, font_filename
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+UNITS_PER_EM = 1000
+ASCENT = 800
+DESCENT = -200
+
+# Pillar order defines the Private Use Area layout
+PILLAR_CODEPOINTS = {
+    0xE000: "CHRONOS",
+    0xE001: "IMAGINARIUM",
+    0xE002: "ARCHITECTUS",
+    0xE003: "LUDUS",
+    0xE004: "OCULUS",
+    0xE005: "OPERATUS",
 }
 
-def extract_svg_path(svg_file):
-    """Extract path data from SVG file."""
-    tree = ET.parse(svg_file)
-    root = tree.getroot()
-
-    # Collect all path, line, circle, rect, polygon elements
-    paths = []
-
-    # Remove namespace if present
-    ns = {'svg': 'http://www.w3.org/2000/svg'}
+def tier_mappings(tier):
+    """Map PUA codepoints to (NAME, svg path) for one icon tier."""
+    return {
+        codepoint: (name, f"assets/icons/{tier}/{name.lower()}.svg")
+        for codepoint, name in PILLAR_CODEPOINTS.items()
+    }
 
-    for elem in root.iter():
-        tag = elem.tag.split('}')[-1]  # Remove namespace
-
-        if tag == 'path' and 'd' in elem.attrib:
-            paths.append(elem.attrib['d'])
-
-        elif tag == 'line':
-            x1, y1 = float(elem.attrib['x1']), float(elem.attrib['y1'])
-            x2, y2 = float(elem.attrib['x2']), float(elem.attrib['y2'])
-            paths.append(f'M{x1},{y1} L{x2},{y2}')
+# Icon mappings to Private Use Area
+ICON_MAPPINGS = tier_mappings(DEFAULT_TIER)
+
+# Combined font: one 256-codepoint PUA block per tier. The default tier
+# keeps U+E000-U+E005 so existing launcher strings stay valid.
+TIER_PUA_BASE = {
+    "simple": 0xE000,
+    "medium": 0xE100,
+    "detailed": 0xE200,
+    "emoji-grade": 0xE300,
+}
 
-        elif tag == 'circle':
-            cx, cy = float(elem.attrib['cx']), float(elem.attrib['cy'])
-            r = float(elem.attrib['r'])
-            # Approximate circle with bezier curves
-            paths.append(
-                f'M{cx-r},{cy} '
-                f'a{r},{r} 0 1,0 {r*2},0 '
-                f'a{r},{r} 0 1,0 {-r*2},0'
+def combined_mappings(tiers=ICON_TIERS):
+    """Map PUA codepoints to (NAME, svg path) for all tiers in one font."""
+    mappings = {}
+    for tier in tiers:
+        offset = TIER_PUA_BASE[tier] - 0xE000
+        for codepoint, (name, svg_path) in tier_mappings(tier).items():
+            if tier != DEFAULT_TIER:
+                name = f"{name}.{tier.upper()}"
+            mappings[codepoint + offset] = (name, svg_path)
+    return mappings
+
+def parse_transform(value):
+    """Parse an SVG transform attribute into a fontTools Transform."""
+    transform = Identity
+    for name, args in re.findall(r'(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)',
+                                 value or ''):
+        v = [float(a) for a in re.split(r'[\s,]+', args.strip()) if a]
+        if name == 'matrix':
+            step = Transform(*v)
+        elif name == 'translate':
+            step = Identity.translate(v[0], v[1] if len(v) > 1 else 0)
+        elif name == 'scale':
+            step = Identity.scale(v[0], v[1] if len(v) > 1 else v[0])
+        elif name == 'rotate':
+            cx, cy = v[1:3] if len(v) == 3 else (0, 0)
+            step = Identity.translate(cx, cy).rotate(math.radians(v[0])).translate(-cx, -cy)
+        elif name == 'skewX':
+            step = Identity.skew(math.radians(v[0]), 0)
+        else:
+            step = Identity.skew(0, math.radians(v[0]))
+        # Functions apply right to left, like nested groups
+        transform = transform.transform(step)
+    return transform
+
+def viewbox_transform(viewbox):
+    """Map an SVG viewBox onto the 0 0 100 100 box build_glyph() expects."""
+    if not viewbox:
+        return Identity
+    x, y, width, height = (float(v) for v in re.split(r'[\s,]+', viewbox.strip()))
+    return Identity.scale(100 / max(width, height)).translate(-x, -y)
+
+def _walk(elem, transform):
+    """Yield (element, transform to the root viewBox) for elem and descendants."""
+    transform = transform.transform(parse_transform(elem.attrib.get('transform')))
+    yield elem, transform
+    for child in elem:
+        yield from _walk(child, transform)
+
+def _element_path(elem):
+    """Path data for one shape element, in its own coordinates."""
+    tag = elem.tag.split('}')[-1]  # Remove namespace
+
+    if tag == 'path' and 'd' in elem.attrib:
+        return elem.attrib['d']
+
+    elif tag == 'line':
+        x1, y1 = float(elem.attrib['x1']), float(elem.attrib['y1'])
+        x2, y2 = float(elem.attrib['x2']), float(elem.attrib['y2'])
+        return f'M{x1},{y1} L{x2},{y2}'
+
+    elif tag == 'circle':
+        cx, cy = float(elem.attrib.get('cx', 0)), float(elem.attrib.get('cy', 0))
+        r = float(elem.attrib['r'])
+        # Approximate circle with bezier curves
+        return (
+            f'M{cx-r},{cy} '
+            f'a{r},{r} 0 1,0 {r*2},0 '
+            f'a{r},{r} 0 1,0 {-r*2},0'
+        )
+
+    elif tag == 'ellipse':
+        cx, cy = float(elem.attrib.get('cx', 0)), float(elem.attrib.get('cy', 0))
+        rx, ry = float(elem.attrib['rx']), float(elem.attrib['ry'])
+        return (
+            f'M{cx-rx},{cy} '
+            f'a{rx},{ry} 0 1,0 {rx*2},0 '
+            f'a{rx},{ry} 0 1,0 {-rx*2},0'
+        )
+
+    elif tag == 'rect':
+        x, y = float(elem.attrib.get('x', 0)), float(elem.attrib.get('y', 0))
+        w, h = float(elem.attrib['width']), float(elem.attrib['height'])
+        rx = float(elem.attrib.get('rx', 0))
+        if rx > 0:
+            return (
+                f'M{x+rx},{y} '
+                f'h{w-2*rx} '
+                f'a{rx},{rx} 0 0,1 {rx},{rx} '
+                f'v{h-2*rx} '
+                f'a{rx},{rx} 0 0,1 {-rx},{rx} '
+                f'h{-w+2*rx} '
+                f'a{rx},{rx} 0 0,1 {-rx},{-rx} '
+                f'v{-h+2*rx} '
+                f'a{rx},{rx} 0 0,1 {rx},{-rx} Z'
             )
+        else:
+            return f'M{x},{y} h{w} v{h} h{-w} Z'
+
+    elif tag == 'polygon' and 'points' in elem.attrib:
+        points = elem.attrib['points'].strip().split()
+        if points:
+            first = points[0].split(',')
+            path = f'M{first[0]},{first[1]}'
+            for point in points[1:]:
+                coords = point.split(',')
+                path += f' L{coords[0]},{coords[1]}'
+            return path + ' Z'
+
+    return None
+
+def _transform_path(path_data, transform):
+    pen = SVGPathPen(None, ntos=lambda n: f"{n:.3f}".rstrip("0").rstrip("."))
+    parse_path(path_data, TransformPen(pen, transform))
+    return pen.getCommands()
 
-        elif tag == 'ellipse':
-            cx, cy = float(elem.attrib['cx']), float(elem.attrib['cy'])
-            rx, ry = float(elem.attrib['rx']), float(elem.attrib['ry'])
-            paths.append(
-                f'M{cx-rx},{cy} '
-                f'a{rx},{ry} 0 1,0 {rx*2},0 '
-                f'a{rx},{ry} 0 1,0 {-rx*2},0'
-            )
+def extract_svg_path(svg_file):
+    """
+    Extract path data from SVG file.
 
-        elif tag == 'rect':
-            x, y = float(elem.attrib['x']), float(elem.attrib['y'])
-            w, h = float(elem.attrib['width']), float(elem.attrib['height'])
-            rx = float(elem.attrib.get('rx', 0))
-            if rx > 0:
-                paths.append(
-                    f'M{x+rx},{y} '
-                    f'h{w-2*rx} '
-                    f'a{rx},{rx} 0 0,1 {rx},{rx} '
-                    f'v{h-2*rx} '
-                    f'a{rx},{rx} 0 0,1 {-rx},{rx} '
-                    f'h{-w+2*rx} '
-                    f'a{rx},{rx} 0 0,1 {-rx},{-rx} '
-                    f'v{-h+2*rx} '
-                    f'a{rx},{rx} 0 0,1 {rx},{-rx} Z'
-                )
-            else:
-                paths.append(
-                    f'M{x},{y} h{w} v{h} h{-w} Z'
-                )
-
-        elif tag == 'polygon' and 'points' in elem.attrib:
-            points = elem.attrib['points'].strip().split()
-            if points:
-                first = points[0].split(',')
-                path = f'M{first[0]},{first[1]}'
-                for point in points[1:]:
-                    coords = point.split(',')
-                    path += f' L{coords[0]},{coords[1]}'
-                path += ' Z'
-                paths.append(path)
+    Element and group transforms are applied and the viewBox is mapped
+    onto 0 0 100 100, so the result always suits build_glyph().
+    """
+    root = ET.parse(svg_file).getroot()
+
+    # Collect all path, line, circle, ellipse, rect, polygon elements
+    paths = []
+    for elem, transform in _walk(root, viewbox_transform(root.attrib.get('viewBox'))):
+        path = _element_path(elem)
+        if not path:
+            continue
+        if transform != Identity:
+            path = _transform_path(path, transform)
+        paths.append(path)
 
     return ' '.join(paths)
 
@@ -120,76 +238,344 @@ def scale_and_center_path(path_data, viewbox=(0, 0, 100, 100), units_per_em=1000
 
     return path_data, transform
 
-def create_font():
-    """Generate the Dendrovia icon font."""
-    print("🎨 Generating Dendrovia custom icon font...\n")
+def build_glyph(path_data, viewbox=(0, 0, 100, 100), units_per_em=UNITS_PER_EM):
+    """
+    Convert SVG path data into a TrueType glyph.
 
-    fb = FontBuilder(1000, isTTF=True)  # 1000 units per em
+    Cubic curves are approximated with quadratics (cu2qu) and the
+    contour direction is reversed to follow TrueType's clockwise rule.
+    """
+    scale = units_per_em / max(viewbox[2], viewbox[3])
 
-    # Font metadata
-    fb.setupHead(unitsPerEm=1000, lowestRecPPEM=8)
-    fb.setupPost()  # PostScript table
+    glyph_pen = TTGlyphPen(None)
+    cu2qu_pen = Cu2QuPen(glyph_pen, max_err=1.0, reverse_direction=True)
+    # SVG y grows downwards from the top of the viewBox; the top of the
+    # viewBox sits on the ascender line.
+    pen = TransformPen(cu2qu_pen, (
+        scale, 0, 0, -scale,
+        -viewbox[0] * scale, ASCENT + viewbox[1] * scale,
+    ))
+    parse_path(path_data, pen)
+
+    return glyph_pen.glyph()
+
+def _split_contours(glyph):
+    """Yield each contour of a simple glyph as a list of (x, y, flag)."""
+    start = 0
+    for end in glyph.endPtsOfContours:
+        yield [
+            (x, y, glyph.flags[i] & 0x01)  # keep only the on-curve bit
+            for i, (x, y) in enumerate(glyph.coordinates[start:end + 1], start)
+        ]
+        start = end + 1
+
+def _normalize_contour(points):
+    """
+    Translate a contour to its bbox origin and rotate it to a canonical
+    start point, so identical shapes hash the same wherever they sit.
+    Returns (normalized points, (dx, dy) offset).
+    """
+    dx = min(x for x, _, _ in points)
+    dy = min(y for _, y, _ in points)
+    shifted = [(x - dx, y - dy, on) for x, y, on in points]
+    start = shifted.index(min(shifted))
+    return tuple(shifted[start:] + shifted[:start]), (dx, dy)
+
+def _glyph_from_contours(contours):
+    """Build a simple TrueType glyph from (x, y, flag) contours."""
+    glyph = Glyph()
+    coordinates = []
+    flags = array("B")
+    ends = []
+    for contour in contours:
+        for x, y, on in contour:
+            coordinates.append((x, y))
+            flags.append(on)
+        ends.append(len(coordinates) - 1)
+    glyph.coordinates = GlyphCoordinates(coordinates)
+    glyph.flags = flags
+    glyph.endPtsOfContours = ends
+    glyph.numberOfContours = len(ends)
+    glyph.program = ttProgram.Program()
+    glyph.program.fromBytecode(b"")
+    return glyph
+
+def _composite_glyph(components):
+    """Build a composite TrueType glyph from (glyph name, dx, dy) references."""
+    glyph = Glyph()
+    glyph.numberOfContours = -1
+    glyph.components = []
+    for name, dx, dy in components:
+        component = GlyphComponent()
+        component.glyphName = name
+        component.x, component.y = dx, dy
+        component.flags = 0
+        glyph.components.append(component)
+    return glyph
+
+def dedupe_glyphs(glyphs, min_points=8):
+    """
+    Store contours repeated across glyphs once, as component glyphs.
 
-    fb.setupNameTable(
-        familyName="Dendrovia Icons",
-        styleName="Regular",
-        uniqueFontID="Dendrovia-Icons-Regular",
-        fullName="Dendrovia Icons Regular",
-        psName="DendroviaIcons-Regular",
-        version="1.0"
-    )
+    Contours are hashed after normalization (see _normalize_contour).
+    Every contour with at least `min_points` points that occurs more than
+    once becomes a shared glyph ("contour.NNN"); glyphs using it turn into
+    composites that reference it with a translation, plus a "<name>.rest"
+    component holding their remaining contours. Smaller contours cost
+    less than a component record and are left in place.
+
+    Returns (new glyphs dict, number of shared contours, references).
+    """
+    occurrences = defaultdict(list)
+    split = {}
+    for name, glyph in glyphs.items():
+        if glyph.numberOfContours <= 0:
+            continue
+        split[name] = []
+        for contour in _split_contours(glyph):
+            normalized, offset = _normalize_contour(contour)
+            key = hashlib.blake2b(repr(normalized).encode(), digest_size=16).digest()
+            split[name].append((contour, key, normalized, offset))
+            if len(contour) >= min_points:
+                occurrences[key].append(name)
+
+    shared = {}
+    for key, names in occurrences.items():
+        if len(names) > 1:
+            shared[key] = f"contour.{len(shared):03d}"
+
+    result = {}
+    component_glyphs = {}
+    references = 0
+    for name, glyph in glyphs.items():
+        contours = split.get(name)
+        if not contours or not any(key in shared for _, key, _, _ in contours):
+            result[name] = glyph
+            continue
+
+        components = []
+        rest = []
+        for contour, key, normalized, (dx, dy) in contours:
+            if key in shared:
+                shared_name = shared[key]
+                if shared_name not in component_glyphs:
+                    component_glyphs[shared_name] = _glyph_from_contours([normalized])
+                components.append((shared_name, dx, dy))
+                references += 1
+            else:
+                rest.append(contour)
+        if rest:
+            component_glyphs[f"{name}.rest"] = _glyph_from_contours(rest)
+            components.append((f"{name}.rest", 0, 0))
+        result[name] = _composite_glyph(components)
+
+    result.update(component_glyphs)
+    return result, len(shared), references
 
+def build_font(glyphs, cmap, family_name="Dendrovia Icons"):
+    """
+    Assemble a TrueType font from built glyphs.
+
+    glyphs: {glyph_name: Glyph}, cmap: {codepoint: glyph_name}
+    """
+    glyph_order = [".notdef"] + [name for name in glyphs if name != ".notdef"]
+    ps_family = family_name.replace(" ", "")
+
+    fb = FontBuilder(UNITS_PER_EM, isTTF=True)
+    fb.setupGlyphOrder(glyph_order)
+    fb.setupCharacterMap(cmap)
+
+    all_glyphs = {".notdef": TTGlyphPen(None).glyph()}
+    all_glyphs.update(glyphs)
+    fb.setupGlyf(all_glyphs)
+
+    glyf = fb.font["glyf"]
+    metrics = {".notdef": (UNITS_PER_EM // 2, 0)}
+    for name in glyphs:
+        # Monospaced, full-width glyphs; lsb is the outline's xMin
+        metrics[name] = (UNITS_PER_EM, getattr(glyf[name], "xMin", 0))
+    fb.setupHorizontalMetrics(metrics)
+
+    fb.setupHorizontalHeader(ascent=ASCENT, descent=DESCENT, lineGap=0)
+    fb.setupNameTable({
+        "familyName": family_name,
+        "styleName": "Regular",
+        "uniqueFontIdentifier": f"{ps_family}-Regular",
+        "fullName": f"{family_name} Regular",
+        "psName": f"{ps_family}-Regular",
+        "version": "Version 1.0",
+    })
     fb.setupOS2(
-        sTypoAscender=800,
-        sTypoDescender=-200,
+        sTypoAscender=ASCENT,
+        sTypoDescender=DESCENT,
         sTypoLineGap=0,
-        usWinAscent=1000,
-        usWinDescent=200
+        usWinAscent=UNITS_PER_EM,
+        usWinDescent=-DESCENT,
     )
+    fb.setupPost()
+    fb.font["head"].lowestRecPPEM = 8
+
+    return fb.font
+
+def serialize_font(font, flavor=None):
+    """Serialize a font to bytes; flavor is None (TTF), 'woff' or 'woff2'."""
+    font.flavor = flavor
+    buffer = BytesIO()
+    try:
+        font.save(buffer)
+    finally:
+        font.flavor = None
+    return buffer.getvalue()
+
+def serialize_smallest(fonts, fmt):
+    """
+    Serialize each font variant as fmt ("ttf", "woff" or "woff2").
 
-    fb.setupHhea(ascent=800, descent=-200, lineGap=0)
+    Returns (index of the smallest variant, serialized bytes of every
+    variant). Component references cost a few bytes each and brotli
+    already folds repeats in WOFF2, so the deduplicated variant is not
+    always the smaller one.
+    """
+    flavor = None if fmt == "ttf" else fmt
+    data = [serialize_font(font, flavor) for font in fonts]
+    return min(range(len(fonts)), key=lambda i: len(data[i])), data
+
+def font_mappings(tier):
+    """Codepoint mappings for one tier, or for every tier when tier is "all"."""
+    return combined_mappings() if tier == "all" else tier_mappings(tier)
+
+def extract_paths(tier):
+    """Extract path data for every icon of a tier, keyed by SVG path."""
+    paths = {}
+    with asset_trace.span("extract_paths", tier=tier):
+        for name, svg_path in font_mappings(tier).values():
+            svg_file = PROJECT_ROOT / svg_path
+            if svg_file.exists():
+                paths[svg_path] = extract_svg_path(svg_file)
+    asset_trace.count("svgs_extracted", len(paths))
+    return paths
+
+def create_font(tier=DEFAULT_TIER, output_dir=None, formats=("ttf", "woff2"),
+                dedupe=True, paths=None):
+    """
+    Generate the Dendrovia icon font.
+
+    tier is one of ICON_TIERS, or "all" to put every tier into one font
+    (see TIER_PUA_BASE). paths optionally supplies already extracted path
+    data keyed by SVG path (see extract_paths).
+    """
+    print(f"🎨 Generating Dendrovia custom icon font ({tier})...\n")
+
+    mappings = font_mappings(tier)
 
-    # Character map
     cmap = {}
-    glyphs = {".notdef": None}  # Required glyph
-    metrics = {".notdef": (500, 0)}  # width, left side bearing
+    glyphs = {}
 
     # Process each icon
-    for codepoint, (name, svg_path) in ICON_MAPPINGS.items():
-        print(f"  {chr(codepoint)} ({name:12}) <- {svg_path}")
+    with asset_trace.span("build_glyphs", tier=tier):
+        for codepoint, (name, svg_path) in mappings.items():
+            print(f"  {chr(codepoint)} ({name:12}) <- {svg_path}")
 
-        svg_file = Path(__file__).parent.parent / svg_path
+            svg_file = PROJECT_ROOT / svg_path
 
-        if not svg_file.exists():
-            print(f"    ❌ File not found: {svg_file}")
-            continue
+            if paths is None and not svg_file.exists():
+                print(f"    ❌ File not found: {svg_file}")
+                continue
 
-        try:
-            # Extract SVG paths
-            path_data = extract_svg_path(svg_file)
+            try:
+                # Extract SVG paths
+                if paths is not None:
+                    path_data = paths.get(svg_path)
+                else:
+                    path_data = extract_svg_path(svg_file)
 
-            if not path_data:
-                print(f"    ⚠️  No paths found in SVG")
-                continue
+                if not path_data:
+                    print(f"    ⚠️  No paths found in SVG")
+                    continue
 
-            # For now, store path data (we'll need FontForge for full conversion)
-            glyph_name = name.lower()
-            glyphs[glyph_name] = path_data
-            metrics[glyph_name] = (1000, 0)  # Full width
-            cmap[codepoint] = glyph_name
+                glyph_name = name.lower()
+                glyphs[glyph_name] = build_glyph(path_data)
+                cmap[codepoint] = glyph_name
 
-            print(f"    ✅ Processed")
+                print(f"    ✅ Processed")
 
-        except Exception as e:
-            print(f"    ❌ Error: {e}")
+            except Exception as e:
+                print(f"    ❌ Error: {e}")
 
+    asset_trace.count("glyphs_built", len(glyphs))
     print(f"\n📊 Generated {len(cmap)} glyphs")
-    print("\n⚠️  Note: Full font generation requires FontForge")
-    print("     SVG paths extracted successfully, but conversion")
-    print("     to TrueType outlines needs FontForge.")
-    print("\nNext step: Install FontForge and use fontforge-generate.py")
 
-    return cmap, glyphs, metrics
+    with asset_trace.span("build_font"):
+        font = build_font(glyphs, cmap)
+    fonts = [font]
+
+    if dedupe:
+        with asset_trace.span("dedupe_glyphs") as dedupe_span:
+            deduped, shared, references = dedupe_glyphs(glyphs)
+            dedupe_span.set(shared=shared, references=references)
+        print(f"♻️  Found {shared} shared contours ({references} references)")
+        if shared:
+            with asset_trace.span("build_font", deduped=True):
+                fonts.append(build_font(deduped, cmap))
+
+    outputs = {}
+    for fmt in formats:
+        with asset_trace.span("serialize", format=fmt, variants=len(fonts)):
+            smallest, sizes = serialize_smallest(fonts, fmt)
+        outputs[fmt] = sizes[smallest]
+        if fmt == "ttf":
+            font = fonts[smallest]
+        if len(sizes) > 1:
+            saved = len(sizes[0]) - len(outputs[fmt])
+            print(f"    {fmt:6} {len(sizes[0])} -> {len(outputs[fmt])} bytes"
+                  f" (saved {saved} bytes)")
+
+    if output_dir is not None:
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        print(f"\n📦 Writing font files to {output_dir}...\n")
+        for fmt, data in outputs.items():
+            out_path = output_dir / font_filename(tier, fmt)
+            with asset_trace.span("write", path=str(out_path)):
+                out_path.write_bytes(data)
+            asset_trace.count("bytes_written", len(data))
+            print(f"  ✅ {out_path}")
+
+    return font
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the Dendrovia icon font")
+    parser.add_argument("--tier", choices=ICON_TIERS + ("all",), default=DEFAULT_TIER)
+    parser.add_argument("--out-dir", default=str(PROJECT_ROOT / "assets" / "fonts"))
+    parser.add_argument("--formats", default="ttf,woff2",
+                        help="comma-separated list of ttf, woff, woff2")
+    parser.add_argument("--dedupe", action=argparse.BooleanOptionalAction, default=True,
+                        help="store repeated contours once as component glyphs")
+    parser.add_argument("--extract", metavar="JSON",
+                        help="only extract SVG path data and write it to JSON")
+    parser.add_argument("--paths-json", metavar="JSON", action="append",
+                        help="build from path data written by --extract (repeatable)")
+    args = parser.parse_args()
+
+    if args.extract:
+        paths = extract_paths(args.tier)
+        Path(args.extract).parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(paths, indent=1, sort_keys=True) + "\n"
+        Path(args.extract).write_text(data)
+        asset_trace.count("bytes_written", len(data.encode()))
+        print(f"✅ Extracted {len(paths)} icons -> {args.extract}")
+        return
+
+    paths = None
+    if args.paths_json:
+        paths = {}
+        with asset_trace.span("load_paths", files=len(args.paths_json)):
+            for paths_file in args.paths_json:
+                paths.update(json.loads(Path(paths_file).read_text()))
+
+    with asset_trace.span("create_font", tier=args.tier):
+        create_font(args.tier, args.out_dir, tuple(args.formats.split(",")), args.dedupe, paths)
 
 if __name__ == "__main__":
-    create_font()
+    main()
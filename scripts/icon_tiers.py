@@ -0,0 +1,17 @@
+"""
+Icon tiers and icon font file names, shared by the font generators.
+
+generate-icon-font.py re-exports these; this module has no fontTools
+dependency, so fontforge-generate.py (under FontForge's own Python) and
+build-assets.py can import it directly.
+"""
+
+# Icon tiers, from lowest to highest fidelity (assets/icons/<tier>/)
+ICON_TIERS = ("simple", "medium", "detailed", "emoji-grade")
+DEFAULT_TIER = "simple"
+
+
+def font_filename(tier, fmt):
+    """File name of a tier's font ("all" for the combined font) in format fmt."""
+    suffix = "" if tier == DEFAULT_TIER else f"-{tier}"
+    return f"dendrovia-icons{suffix}.{fmt}"
@@ -0,0 +1,34 @@
+"""
+Import sibling scripts whose hyphenated file names are not importable.
+
+    from script_loader import load_icon_font_module
+    icon_font = load_icon_font_module()
+
+Each script is executed once per process and then reused.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+
+def load_script(filename, module_name):
+    """Import scripts/<filename> as module_name, once per process."""
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, SCRIPT_DIR / filename)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+    return module
+
+
+def load_icon_font_module():
+    """Import generate-icon-font.py."""
+    return load_script("generate-icon-font.py", "generate_icon_font")
@@ -0,0 +1,20 @@
+"""Shared fixtures for the workspace-launcher tests"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+LAUNCHER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, LAUNCHER_DIR)
+
+
+@pytest.fixture(scope='session')
+def grid():
+    """ghostty-window-grid.py, imported as a module"""
+    spec = importlib.util.spec_from_file_location(
+        'ghostty_window_grid', os.path.join(LAUNCHER_DIR, 'ghostty-window-grid.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,192 @@
+"""
+Tests for window_backends.py; no real window system is touched
+
+    python3 -m pytest scripts/workspace-launcher/__tests__
+"""
+
+import os
+import struct
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from window_backends import AppleScriptBackend, FakeBackend, WindowMove, make_bounds
+
+
+def fail_osascript(monkeypatch):
+    """Make every subprocess.run look like a failed osascript; returns its calls"""
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append((args, kwargs))
+        return subprocess.CompletedProcess(args, 1, '', 'execution error: not authorized (-1743)\n')
+
+    monkeypatch.setattr(subprocess, 'run', run)
+    return calls
+
+
+MOVES = [
+    WindowMove(1, 101, 10, 60, 600, 500),
+    WindowMove(3, 103, 620.6, 60, 600, 500),
+    WindowMove(2, 102, 1230, 570, 600, 500),
+]
+
+
+def test_build_script_applies_every_move_in_one_script():
+    script = AppleScriptBackend(window_source='system-events').build_script(MOVES)
+
+    assert script.count('tell application "System Events"') == 1
+    assert 'set position of window 1 to {10, 60}' in script
+    assert 'set position of window 3 to {620, 60}' in script
+    assert 'set position of window 2 to {1230, 570}' in script
+    assert script.count('set size of window') == 3
+    assert script.count('        try') == 3
+
+
+def test_applescript_apply_moves_runs_one_osascript_and_raises_on_failure(monkeypatch):
+    calls = fail_osascript(monkeypatch)
+    backend = AppleScriptBackend(window_source='system-events')
+
+    backend.apply_moves([])
+    assert calls == []
+
+    with pytest.raises(RuntimeError, match='not authorized'):
+        backend.apply_moves(MOVES)
+    assert len(calls) == 1
+    assert calls[0][1]['input'] == backend.build_script(MOVES)
+
+
+def test_position_windows_grid_reports_a_failed_transaction(grid, monkeypatch):
+    fail_osascript(monkeypatch)
+    windows = [
+        {'number': i, 'name': f'Window {i}', 'bounds': make_bounds(0, 0, 800, 600), 'pid': 1}
+        for i in (1, 2)
+    ]
+    backend = AppleScriptBackend(window_source='system-events')
+    monkeypatch.setattr(backend, 'screens', lambda: [make_bounds(0, 0, 1920, 1080)])
+
+    assert grid.position_windows_grid(windows, backend) is False
+
+
+def test_fake_backend_records_calls():
+    backend = FakeBackend(screens=[make_bounds(0, 0, 1920, 1080)])
+    window = backend.add_window('Window 1')
+    backend.list_windows()
+    backend.screens()
+    move = WindowMove(1, window['number'], 10, 60, 600, 500)
+    backend.apply_moves(iter([move]))
+
+    assert backend.calls == [('list_windows',), ('screens',), ('apply_moves', [move])]
+    assert backend.list_windows()[0]['bounds'] == make_bounds(10, 60, 600, 500)
+
+
+def test_fake_backend_simulates_transaction_and_per_move_latency():
+    backend = FakeBackend(transaction_latency=0.02, move_latency=0.01)
+    windows = [backend.add_window(f'Window {i}') for i in range(3)]
+    moves = [WindowMove(i + 1, w['number'], 0, 0, 100, 100) for i, w in enumerate(windows)]
+
+    start = time.perf_counter()
+    backend.apply_moves([])
+    empty = time.perf_counter() - start
+
+    start = time.perf_counter()
+    backend.apply_moves(moves)
+    batch = time.perf_counter() - start
+
+    assert empty >= 0.02
+    assert batch >= 0.05
+
+
+class StubProperty:
+    def __init__(self, value):
+        self.value = value
+
+
+class StubWindow:
+    """Just enough of an Xlib window for X11Backend.list_windows()"""
+
+    def __init__(self, window_id, properties=None, wm_class=('ghostty', 'com.mitchellh.ghostty'),
+                 geometry=(0, 0, 800, 600), gone=False):
+        self.id = window_id
+        self.properties = properties or {}
+        self.wm_class = wm_class
+        self.geometry = geometry
+        self.gone = gone
+
+    def _check(self):
+        if self.gone:
+            import Xlib.error
+            data = struct.pack('=BBHIHB21x', 0, 3, 1, self.id, 0, 14)
+            raise Xlib.error.BadWindow(None, data)
+
+    def get_wm_class(self):
+        return self.wm_class
+
+    def get_wm_name(self):
+        return None
+
+    def get_full_property(self, atom, property_type):
+        value = self.properties.get(atom)
+        return StubProperty(value) if value is not None else None
+
+    def get_geometry(self):
+        self._check()
+        x, y, width, height = self.geometry
+        return SimpleNamespace(x=x, y=y, width=width, height=height)
+
+    def translate_coords(self, root, x, y):
+        self._check()
+        return SimpleNamespace(x=-self.geometry[0], y=-self.geometry[1])
+
+
+class StubDisplay:
+    def __init__(self, root, windows):
+        self.root = root
+        self.windows = {window.id: window for window in windows}
+
+    def screen(self):
+        return SimpleNamespace(root=self.root)
+
+    def intern_atom(self, name):
+        return name  # atoms stay readable in the stub properties
+
+    def create_resource_object(self, kind, window_id):
+        return self.windows[window_id]
+
+
+def test_x11_list_windows_skips_windows_destroyed_while_listing(monkeypatch):
+    pytest.importorskip('Xlib')
+    import window_backends
+
+    window_backends._import_xlib()
+    live = StubWindow(0x400001, {'_NET_WM_NAME': b'CHRONOS', '_NET_WM_PID': [4242]},
+                      geometry=(10, 60, 600, 500))
+    gone = StubWindow(0x400002, {'_NET_WM_NAME': b'LUDUS'}, gone=True)
+    root = StubWindow(0x100, {'_NET_CLIENT_LIST': [gone.id, live.id]})
+    display = StubDisplay(root, [live, gone])
+    monkeypatch.setattr(window_backends, 'xdisplay', SimpleNamespace(Display=lambda name: display))
+
+    backend = window_backends.X11Backend()
+    assert backend.list_windows() == [{
+        'number': live.id,
+        'name': 'CHRONOS',
+        'bounds': make_bounds(10, 60, 600, 500),
+        'pid': 4242,
+    }]
+
+
+def test_system_events_listing_reads_the_desktop_bounds(monkeypatch):
+    output = '4242\t0\t-25\t4480\t1415\nCHRONOS\t10\t60\t600\t500\n'
+    monkeypatch.setattr(subprocess, 'run',
+                        lambda args, **kwargs: subprocess.CompletedProcess(args, 0, output, ''))
+    backend = AppleScriptBackend(window_source='system-events')
+
+    windows = backend.list_windows()
+    assert windows == [{'number': 1, 'name': 'CHRONOS',
+                        'bounds': make_bounds(10, 60, 600, 500), 'pid': 4242}]
+    assert backend.desktop_bounds == make_bounds(0, -25, 4480, 1440)
@@ -0,0 +1,105 @@
+"""
+Tests for the window index daemon, driven through the fake window backend
+
+    python3 -m pytest scripts/workspace-launcher/__tests__
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from window_backends import FakeBackend, make_bounds
+from window_index import WindowDaemon, WindowIndex
+
+
+class SizeHintBackend(FakeBackend):
+    """Fake backend whose window manager trims every move to a 17px text grid"""
+
+    def apply_moves(self, moves):
+        super().apply_moves(moves)
+        by_number = {w['number']: w for w in self.windows}
+        for move in moves:
+            window = by_number[move.number]
+            bounds = dict(window['bounds'], Height=move.height - move.height % 17 - 17)
+            self.move_window(move.number, bounds)
+
+
+def drain(daemon, max_steps=20):
+    """Run daemon steps until no events are pending; returns all moves"""
+    moves = []
+    for _ in range(max_steps):
+        if daemon.backend.events.empty():
+            return moves
+        moves += daemon.step() or []
+    raise AssertionError(f'daemon still re-tiling after {max_steps} steps')
+
+
+def test_adjusted_moves_are_not_reissued():
+    backend = SizeHintBackend()
+    for i in range(3):
+        backend.add_window(f'Window {i + 1}')
+    daemon = WindowDaemon(backend, resync_interval=60)
+    daemon.resync()
+    daemon.retile()
+
+    assert drain(daemon) == []
+    applied = [call for call in backend.calls if call[0] == 'apply_moves']
+    assert sum(len(call[1]) for call in applied) == 3
+
+
+def test_dragged_window_is_moved_back():
+    backend = SizeHintBackend()
+    window = backend.add_window('Window 1')
+    daemon = WindowDaemon(backend, resync_interval=60, settle_time=0.05)
+    daemon.resync()
+    daemon.retile()
+    drain(daemon)
+
+    time.sleep(0.1)
+    backend.move_window(window['number'], make_bounds(500, 500, 300, 200))
+    moves = drain(daemon)
+    assert [move.number for move in moves] == [window['number']]
+
+
+def test_resync_skips_windows_closed_meanwhile():
+    backend = FakeBackend()
+    first = backend.add_window('Window 1')
+    backend.add_window('Window 2')
+    daemon = WindowDaemon(backend)
+    daemon.resync()
+    daemon.retile()
+
+    backend.close_window(first['number'])
+    daemon.resync()
+    assert first['number'] not in daemon._issued
+    assert len(daemon.index) == 1
+
+
+def test_resync_refreshes_the_saved_index_without_changes(tmp_path):
+    path = str(tmp_path / 'windows.json')
+    backend = FakeBackend()
+    backend.add_window('Window 1')
+    daemon = WindowDaemon(backend, index_path=path)
+    daemon.resync()
+    daemon.retile()
+    _, age = WindowIndex.load(path)
+
+    time.sleep(0.05)
+    assert not daemon.resync()
+    index, new_age = WindowIndex.load(path)
+    assert new_age < age + 0.05
+    assert len(index) == 1
+
+
+def test_z_order_change_counts_as_a_change():
+    backend = FakeBackend()
+    backend.add_window('Window 1')
+    backend.add_window('Window 2')
+    daemon = WindowDaemon(backend)
+    daemon.resync()
+
+    backend.windows.reverse()  # Window 2 raised to the front
+    assert daemon.resync()
+    assert [w['index'] for w in daemon.index.windows()] == [2, 1]
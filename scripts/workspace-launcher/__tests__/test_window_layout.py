@@ -0,0 +1,169 @@
+"""
+Tests for window_layout.py, driven through the fake window backend
+
+    python3 -m pytest scripts/workspace-launcher/__tests__
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from window_backends import FakeBackend, make_bounds
+from window_index import WindowDaemon
+from window_layout import LayoutPlanCache, grid_cells, layout_shape, plan_layout
+
+
+def tile(backend):
+    """One tiler run: list, plan, apply; returns the moves"""
+    windows = backend.list_windows()
+    screens = backend.screens()
+    cols, rows = layout_shape(len(windows), len(screens))
+    moves = plan_layout(windows, grid_cells(screens, len(windows), cols, rows))
+    backend.apply_moves(moves)
+    return moves
+
+
+def open_windows(backend, count):
+    return [backend.add_window(f'Window {i + 1}') for i in range(count)]
+
+
+def test_default_shape_is_3x2_until_windows_no_longer_fit():
+    assert layout_shape(1) == (3, 2)
+    assert layout_shape(6) == (3, 2)
+    assert layout_shape(7) == (3, 3)
+    assert layout_shape(12, screen_count=2) == (3, 2)
+    assert layout_shape(4, cols=2, rows=2) == (2, 2)
+
+
+def test_opening_a_window_moves_only_that_window():
+    backend = FakeBackend()
+    open_windows(backend, 5)
+    assert len(tile(backend)) == 5
+
+    new_window = backend.add_window('Window 6')
+    moves = tile(backend)
+    assert [move.number for move in moves] == [new_window['number']]
+
+
+def test_closing_windows_moves_nothing():
+    backend = FakeBackend()
+    windows = open_windows(backend, 6)
+    tile(backend)
+
+    backend.close_window(windows[2]['number'])
+    assert tile(backend) == []
+
+    backend.close_window(windows[4]['number'])
+    assert tile(backend) == []
+
+
+def test_reopening_fills_the_hole_left_by_a_closed_window():
+    backend = FakeBackend()
+    windows = open_windows(backend, 6)
+    tile(backend)
+    hole = dict(backend.list_windows()[1]['bounds'])
+
+    backend.close_window(windows[1]['number'])
+    tile(backend)
+    new_window = backend.add_window('Window 7')
+    moves = tile(backend)
+
+    assert [move.number for move in moves] == [new_window['number']]
+    assert backend.list_windows()[-1]['bounds'] == hole
+
+
+def test_daemon_retiles_only_the_new_window():
+    backend = FakeBackend()
+    open_windows(backend, 3)
+    daemon = WindowDaemon(backend, resync_interval=60)
+    daemon.resync()
+    assert len(daemon.retile()) == 3
+    backend.wait_for_events(0)  # drain the echo of those moves
+
+    backend.add_window('Window 4')
+    moves = daemon.step()
+    assert len(moves) == 1
+
+
+def test_plan_cache_matches_grid_cells_for_any_count(tmp_path):
+    screens = [make_bounds(0, 0, 1920, 1080), make_bounds(1920, 0, 1920, 1080)]
+    cache = LayoutPlanCache(str(tmp_path / 'plans.json'))
+    for count in (4, 8, 6, 13, 4):
+        assert cache.cells(screens, count, 3, 2) == grid_cells(screens, count, 3, 2)
+    for count in (3, 5, 3):
+        assert cache.cells(screens, count) == grid_cells(screens, count)
+
+
+def test_plan_cache_tiles_every_window_on_two_screens(tmp_path):
+    backend = FakeBackend(screens=[make_bounds(0, 0, 1920, 1080), make_bounds(1920, 0, 1920, 1080)])
+    cache = LayoutPlanCache(str(tmp_path / 'plans.json'))
+
+    def tile_cached():
+        windows = backend.list_windows()
+        cells = cache.cells(backend.screens(), len(windows), 3, 2)
+        backend.apply_moves(plan_layout(windows, cells))
+
+    open_windows(backend, 4)
+    tile_cached()
+    open_windows(backend, 4)
+    tile_cached()
+
+    bounds = [w['bounds'] for w in backend.list_windows()]
+    assert len({tuple(b.values()) for b in bounds}) == 8
+    assert sum(b['X'] >= 1920 for b in bounds) == 2
+
+
+def test_plan_cache_eviction_is_least_recently_used_across_runs(tmp_path):
+    path = str(tmp_path / 'plans.json')
+    screens = [make_bounds(0, 0, 1920, 1080)]
+    cache = LayoutPlanCache(path)
+    cache.MAX_PLANS = 2
+    cache.cells(screens, 1)
+    cache.cells(screens, 2)
+    cache.save()
+
+    # A hit in a later run refreshes the plan on disk
+    cache = LayoutPlanCache(path)
+    cache.cells(screens, 1)
+    cache.save()
+
+    cache = LayoutPlanCache(path)
+    cache.MAX_PLANS = 2
+    cache.cells(screens, 3)
+    cache.save()
+
+    # The plan for 2 windows was least recently used, so it was evicted
+    cache = LayoutPlanCache(path)
+    cache.cells(screens, 1)
+    assert (cache.hits, cache.misses) == (1, 0)
+    cache.cells(screens, 2)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_fast_mode_requeries_screens_that_no_longer_hold_the_windows(grid, tmp_path):
+    cache = LayoutPlanCache(str(tmp_path / 'plans.json'))
+    cache.remember_screens([make_bounds(0, 0, 1920, 1080)])
+    backend = FakeBackend(screens=[make_bounds(0, 0, 2560, 1440)])
+
+    on_old_screen = [{'bounds': make_bounds(100, 100, 800, 600)}]
+    assert grid.get_screens(backend, 1, cache, True, on_old_screen) == [make_bounds(0, 0, 1920, 1080)]
+    assert backend.calls == []
+
+    off_old_screen = [{'bounds': make_bounds(1800, 700, 600, 500)}]
+    assert grid.get_screens(backend, 1, cache, True, off_old_screen) == [make_bounds(0, 0, 2560, 1440)]
+    assert cache.last_screens() == [make_bounds(0, 0, 2560, 1440)]
+
+
+def test_fast_mode_requeries_screens_when_the_desktop_bounds_change(grid, tmp_path):
+    cache = LayoutPlanCache(str(tmp_path / 'plans.json'))
+    cache.remember_screens([make_bounds(0, 0, 1920, 1080), make_bounds(1920, 0, 1920, 1080)])
+    backend = FakeBackend(screens=[make_bounds(0, 0, 1920, 1080)])
+    windows = [{'bounds': make_bounds(100, 100, 800, 600)}]
+
+    backend.desktop_bounds = make_bounds(0, 0, 3840, 1080)
+    grid.get_screens(backend, 0, cache, True, windows)
+    assert backend.calls == []
+
+    backend.desktop_bounds = make_bounds(0, 0, 1920, 1080)  # second screen unplugged
+    assert grid.get_screens(backend, 0, cache, True, windows) == [make_bounds(0, 0, 1920, 1080)]
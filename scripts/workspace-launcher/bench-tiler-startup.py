@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark ghostty-window-grid.py startup.
+
+Measures, in fresh interpreter processes:
+    - a full re-tile with a cold and with a warm layout plan cache
+      (fake backend, windows read from a saved window index)
+    - which platform modules (PyObjC, python-xlib) loading the tiler imports
+    - the import cost of PyObjC itself, where it is installed
+and in-process, layout math against a plan cache hit.
+
+Usage:
+    python3 bench-tiler-startup.py
+    python3 bench-tiler-startup.py --repeat 20
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+GRID_SCRIPT = os.path.join(SCRIPT_DIR, 'ghostty-window-grid.py')
+sys.path.insert(0, SCRIPT_DIR)
+
+from window_backends import make_bounds
+from window_index import PILLARS, WindowIndex
+from window_layout import LayoutPlanCache, grid_cells
+
+HEAVY_MODULES = ('Quartz', 'AppKit', 'Foundation', 'objc', 'Xlib')
+
+
+def run_seconds(argv):
+    start = time.perf_counter()
+    subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    return time.perf_counter() - start
+
+
+def median_ms(samples):
+    return statistics.median(samples) * 1000
+
+
+def imported_heavy_modules():
+    """Platform modules pulled in by loading the tiler (without running it)"""
+    code = (
+        'import runpy, sys\n'
+        f'runpy.run_path({GRID_SCRIPT!r}, run_name="bench")\n'
+        f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n'
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    return result.stdout.strip() or 'none'
+
+
+def pyobjc_import_ms(repeat):
+    code = 'import Quartz, AppKit, Foundation'
+    if subprocess.run([sys.executable, '-c', code], capture_output=True).returncode != 0:
+        return None
+    baseline = [run_seconds([sys.executable, '-c', 'pass']) for _ in range(repeat)]
+    samples = [run_seconds([sys.executable, '-c', code]) for _ in range(repeat)]
+    return median_ms(samples) - median_ms(baseline)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tiler startup')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = os.path.join(tmp, 'windows.json')
+        plan_path = os.path.join(tmp, 'plans.json')
+
+        windows = [
+            {'number': i + 1, 'name': pillar, 'bounds': make_bounds(0, 0, 800, 600), 'pid': 1}
+            for i, pillar in enumerate(PILLARS)
+        ]
+        WindowIndex(windows).save(index_path)
+
+        argv = [
+            sys.executable, GRID_SCRIPT, '--backend', 'fake',
+            '--from-index', '--index-file', index_path, '--plan-cache', plan_path,
+        ]
+
+        interpreter = [run_seconds([sys.executable, '-c', 'pass']) for _ in range(args.repeat)]
+
+        cold = []
+        for _ in range(args.repeat):
+            if os.path.exists(plan_path):
+                os.remove(plan_path)
+            cold.append(run_seconds(argv))
+
+        warm = [run_seconds(argv) for _ in range(args.repeat)]
+
+        screens = [make_bounds(0, 0, 2560, 1440), make_bounds(2560, 0, 1920, 1080)]
+        cache = LayoutPlanCache(plan_path)
+        cache.cells(screens, 6)
+        number = 2000
+        math_us = timeit.timeit(lambda: grid_cells(screens, 6), number=number) / number * 1e6
+        hit_us = timeit.timeit(lambda: cache.cells(screens, 6), number=number) / number * 1e6
+
+    print(f"Median of {args.repeat} runs\n")
+    print(f"  python -c pass                 {median_ms(interpreter):8.1f}ms")
+    print(f"  re-tile, cold plan cache       {median_ms(cold):8.1f}ms")
+    print(f"  re-tile, warm plan cache       {median_ms(warm):8.1f}ms")
+    print(f"  layout math (2 screens)        {math_us:8.1f}us")
+    print(f"  plan cache hit                 {hit_us:8.1f}us")
+    print(f"\n  platform modules on load:      {imported_heavy_modules()}")
+
+    pyobjc_ms = pyobjc_import_ms(args.repeat)
+    if pyobjc_ms is None:
+        print("  PyObjC import cost:            n/a (PyObjC not installed)")
+    else:
+        print(f"  PyObjC import cost:            {pyobjc_ms:8.1f}ms (skipped by --fast)")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-window vs batched window layout on the fake backend.
+
+Per-window mode issues one backend transaction per window, like the old
+one-osascript-per-window loop; batched mode applies the whole layout in
+a single transaction. The fake backend sleeps to simulate IPC cost, so
+this runs anywhere, including Linux CI.
+
+Usage:
+    python3 bench-window-layout.py
+    python3 bench-window-layout.py --windows 6 12 24 --transaction-ms 60
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from window_backends import FakeBackend, make_bounds
+from window_layout import grid_cells, plan_layout
+
+
+def make_backend(count, transaction_latency, move_latency):
+    backend = FakeBackend(
+        transaction_latency=transaction_latency,
+        move_latency=move_latency,
+    )
+    for i in range(count):
+        backend.add_window(f'Window {i + 1}', make_bounds(40 * i, 40 * i, 800, 600))
+    return backend
+
+
+def time_layout(backend, batched, cols, rows):
+    windows = backend.list_windows()
+    start = time.perf_counter()
+    cells = grid_cells(backend.screens(), len(windows), cols, rows)
+    moves = plan_layout(windows, cells)
+    if batched:
+        backend.apply_moves(moves)
+    else:
+        for move in moves:
+            backend.apply_moves([move])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark window layout latency')
+    parser.add_argument('--windows', type=int, nargs='+', default=[6, 12, 24])
+    parser.add_argument('--transaction-ms', type=float, default=50,
+                        help='simulated cost of one backend round trip')
+    parser.add_argument('--move-ms', type=float, default=2,
+                        help='simulated cost of each move within a transaction')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    transaction_latency = args.transaction_ms / 1000
+    move_latency = args.move_ms / 1000
+
+    print(f"Fake backend: {args.transaction_ms:.0f}ms per transaction, "
+          f"{args.move_ms:.0f}ms per move, median of {args.repeat}\n")
+    print(f"{'windows':>7} {'per-window':>12} {'batched':>10} {'speedup':>8}")
+
+    for count in args.windows:
+        cols = 3
+        rows = -(-count // cols)
+        results = {}
+        for batched in (False, True):
+            samples = []
+            for _ in range(args.repeat):
+                backend = make_backend(count, transaction_latency, move_latency)
+                samples.append(time_layout(backend, batched, cols, rows))
+            results[batched] = statistics.median(samples)
+
+        print(f"{count:>7} {results[False] * 1000:>10.1f}ms {results[True] * 1000:>8.1f}ms "
+              f"{results[False] / results[True]:>7.1f}x")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,12 +13,22 @@ Usage:
     python3 generate-iterm-256.py
     # Writes to ~/Library/Application Support/iTerm2/DynamicProfiles/Dendrovia.plist
 
+    python3 generate-iterm-256.py --local-only
+    # Only writes the version-controlled copy next to this script
+
+    DENDROVIA_TRACE=trace.json python3 generate-iterm-256.py --local-only
+    # Records a timing trace (see scripts/asset_trace.py)
+
 Ref: https://github.com/jake-stewart/color256
 """
 
+import argparse
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asset_trace
 
 # ─── color256 core algorithm (public domain) ────────────────────────────────
 
@@ -239,14 +249,16 @@ def generate_profile_plist(pillar):
     cursor = hex_to_rgb(cfg["cursor"])
     selection = hex_to_rgb(cfg["selection"])
 
-    # Parse base16 palette
-    base16 = [hex_to_rgb(c.strip()) for c in cfg["base16"]]
+    with asset_trace.span("palette", pillar=pillar):
+        # Parse base16 palette
+        base16 = [hex_to_rgb(c.strip()) for c in cfg["base16"]]
 
-    # Generate base16 extras (fix bright variants if needed)
-    generate_base16_extras(base16, bg, fg)
+        # Generate base16 extras (fix bright variants if needed)
+        generate_base16_extras(base16, bg, fg)
 
-    # Generate full 256-color palette
-    palette = generate_256_palette(base16, bg, fg)
+        # Generate full 256-color palette
+        palette = generate_256_palette(base16, bg, fg)
+    asset_trace.count("colors_converted", len(palette))
 
     lines = []
     lines.append(f'    <!-- {pillar}: {cfg["desc"]} -->')
@@ -333,13 +345,21 @@ def generate_profile_plist(pillar):
     return '\n'.join(lines)
 
 
+def generated_at():
+    """Build time, pinned by SOURCE_DATE_EPOCH for reproducible output."""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+    return datetime.now()
+
+
 def generate_full_plist():
     """Generate the complete Dendrovia.plist with all 6 pillar profiles."""
     header = f"""<?xml version="1.0" encoding="UTF-8"?>
 <!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
 <!--
   Dendrovia iTerm2 Dynamic Profiles
-  Generated by generate-iterm-256.py on {datetime.now().strftime('%Y-%m-%d %H:%M')}
+  Generated by generate-iterm-256.py on {generated_at().strftime('%Y-%m-%d %H:%M')}
 
   Full 256-color palettes derived via CIELAB trilinear interpolation
   from each pillar's base16 theme (algorithm: jake-stewart/color256).
@@ -362,13 +382,21 @@ def generate_full_plist():
 
     profiles = []
     for pillar in ["CHRONOS", "IMAGINARIUM", "ARCHITECTUS", "LUDUS", "OCULUS", "OPERATUS"]:
-        profiles.append(generate_profile_plist(pillar))
+        with asset_trace.span("profile", pillar=pillar):
+            profiles.append(generate_profile_plist(pillar))
 
     return header + '\n\n'.join(profiles) + footer
 
 
 def main():
-    plist_content = generate_full_plist()
+    parser = argparse.ArgumentParser(description="Generate Dendrovia iTerm2 profiles")
+    parser.add_argument("--local-only", action="store_true",
+                        help="skip installing into iTerm2's DynamicProfiles")
+    args = parser.parse_args()
+
+    with asset_trace.span("generate_full_plist"):
+        plist_content = generate_full_plist()
+    plist_bytes = len(plist_content.encode())
 
     output_path = os.path.expanduser(
         "~/Library/Application Support/iTerm2/DynamicProfiles/Dendrovia.plist"
@@ -379,14 +407,19 @@ def main():
     local_path = os.path.join(script_dir, "Dendrovia.plist")
 
     # Write to iTerm2 DynamicProfiles
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, 'w') as f:
-        f.write(plist_content)
-    print(f"Wrote iTerm2 profile: {output_path}")
+    if not args.local_only:
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with asset_trace.span("write", path=output_path):
+            with open(output_path, 'w') as f:
+                f.write(plist_content)
+        asset_trace.count("bytes_written", plist_bytes)
+        print(f"Wrote iTerm2 profile: {output_path}")
 
     # Write local copy
-    with open(local_path, 'w') as f:
-        f.write(plist_content)
+    with asset_trace.span("write", path=local_path):
+        with open(local_path, 'w') as f:
+            f.write(plist_content)
+    asset_trace.count("bytes_written", plist_bytes)
     print(f"Wrote local copy:     {local_path}")
 
     # Summary
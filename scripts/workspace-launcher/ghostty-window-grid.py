@@ -1,134 +1,197 @@
 #!/usr/bin/env python3
 """
 Ghostty Window Grid Layout
-Uses Quartz/AppKit to position windows directly
+Positions Ghostty windows through a window backend (see window_backends.py):
+AppleScript on macOS, EWMH on X11, or an in-memory fake for testing.
+Only windows that are not already in their grid cell are moved (see
+window_layout.py), and all moves are applied in a single transaction.
+
+--daemon keeps an index of Ghostty windows and re-tiles on every change
+(see window_index.py); --from-index tiles from the daemon's saved index
+instead of listing every window on screen.
+
+Computed layouts are cached per screen setup (see LayoutPlanCache).
+--fast, meant for a hotkey, reuses the last known screens (while every
+window still lies on them) and lists windows through System Events, so
+PyObjC is never imported.
 """
 
-import Quartz
-import AppKit
-from Foundation import NSMakeRect
+import argparse
+import os
 import sys
-import time
 
-def get_ghostty_windows():
-    """Get all Ghostty windows using Quartz window server"""
-    window_list = Quartz.CGWindowListCopyWindowInfo(
-        Quartz.kCGWindowListOptionOnScreenOnly | Quartz.kCGWindowListExcludeDesktopElements,
-        Quartz.kCGNullWindowID
-    )
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-    ghostty_windows = []
-    for window in window_list:
-        owner_name = window.get(Quartz.kCGWindowOwnerName, '')
-        window_layer = window.get(Quartz.kCGWindowLayer, -1)
-        window_name = window.get(Quartz.kCGWindowName, 'Untitled')
-
-        # Find Ghostty windows (standard windows on layer 0)
-        if owner_name.lower() == 'ghostty' and window_layer == 0:
-            window_number = window.get(Quartz.kCGWindowNumber)
-            bounds = window.get(Quartz.kCGWindowBounds)
-            ghostty_windows.append({
-                'number': window_number,
-                'name': window_name,
-                'bounds': bounds,
-                'pid': window.get(Quartz.kCGWindowOwnerPID)
-            })
-
-    return ghostty_windows
-
-def get_screen_dimensions():
-    """Get main screen dimensions"""
-    screen = AppKit.NSScreen.mainScreen()
-    frame = screen.frame()
-    return frame.size.width, frame.size.height
-
-def position_windows_grid(windows, cols=3, rows=2, gap=10, top_margin=60):
-    """Position windows in a grid layout"""
-    screen_width, screen_height = get_screen_dimensions()
-
-    print(f"Screen dimensions: {screen_width:.0f}x{screen_height:.0f}")
-    print(f"Found {len(windows)} Ghostty windows")
+from window_backends import BACKENDS, default_backend_name, get_backend
+from window_index import DEFAULT_INDEX_PATH, WindowDaemon, WindowIndex
+from window_layout import DEFAULT_PLAN_CACHE_PATH, LayoutPlanCache, grid_cells, layout_shape, plan_layout
 
-    # Calculate usable area
-    usable_width = screen_width
-    usable_height = screen_height - top_margin
-
-    # Calculate window dimensions
-    total_gap_width = gap * (cols - 1)
-    total_gap_height = gap * (rows - 1)
-    window_width = (usable_width - total_gap_width) / cols
-    window_height = (usable_height - total_gap_height) / rows
-
-    print(f"Window size: {window_width:.0f}x{window_height:.0f}")
-
-    # Grid positions
-    grid_positions = [
-        (0, 0),  # CHRONOS
-        (0, 1),  # IMAGINARIUM
-        (0, 2),  # ARCHITECTUS
-        (1, 0),  # LUDUS
-        (1, 1),  # OCULUS
-        (1, 2),  # OPERATUS
-    ]
-
-    # Use accessibility API to move windows
-    app = AppKit.NSRunningApplication.runningApplicationsWithBundleIdentifier_(
-        'com.mitchellh.ghostty'
+def get_ghostty_windows(backend, index_path=None, max_index_age=60.0):
+    """
+    Get all Ghostty windows in pillar order, from the backend or from
+    the daemon's saved index when index_path is given and fresh enough
+    (the daemon rewrites it at least every 30s resync interval)
+    """
+    if index_path:
+        try:
+            index, age = WindowIndex.load(index_path)
+        except (OSError, ValueError, KeyError):
+            index, age = None, None
+        if index is not None and age <= max_index_age:
+            return index.windows()
+        print(f"Window index {index_path} is missing or stale, listing windows")
+    return WindowIndex(backend.list_windows()).windows()
+
+def run_daemon(backend, args):
+    """Re-tile whenever Ghostty windows are created, destroyed or moved"""
+    def report(index, moves):
+        if moves:
+            print(f"Re-tiled {len(moves)} of {len(index)} windows")
+
+    daemon = WindowDaemon(
+        backend,
+        layout={
+            'cols': args.cols, 'rows': args.rows, 'gap': args.gap,
+            'top_margin': args.top_margin, 'screen_count': args.screens,
+            'tolerance': args.tolerance,
+        },
+        poll_interval=args.poll_interval,
+        index_path=args.index_file,
+        on_change=report,
     )
+    mode = 'window events' if backend.supports_events else f'polling every {args.poll_interval}s'
+    print(f"Watching Ghostty windows ({backend.name}, {mode}); Ctrl-C to stop")
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def get_screens(backend, screen_count=1, plan_cache=None, use_cached_screens=False, windows=()):
+    """
+    Screen frames to tile, main screen first (screen_count 0 = all)
+
+    With use_cached_screens, the last screens recorded in plan_cache are
+    reused instead of asking the backend, unless a window lies off all of
+    them or they no longer span the backend's desktop bounds.
+    """
+    screens = plan_cache.last_screens() if plan_cache and use_cached_screens else None
+    if screens and not plan_cache.screens_still_valid(screens, windows, backend.desktop_bounds):
+        print("Screens changed since the last run, querying them again")
+        screens = None
+    if not screens:
+        screens = backend.screens()
+        if plan_cache:
+            plan_cache.remember_screens(screens)
+    return screens[:screen_count] if screen_count else screens
+
+def position_windows_grid(windows, backend, cols=None, rows=None, gap=10, top_margin=60,
+                          screen_count=1, tolerance=4, plan_cache=None,
+                          use_cached_screens=False):
+    """Position windows in a grid layout, moving only misplaced windows"""
+    screens = get_screens(backend, screen_count, plan_cache, use_cached_screens, windows)
+
+    for screen in screens:
+        print(f"Screen dimensions: {screen['Width']:.0f}x{screen['Height']:.0f}"
+              f" at ({screen['X']:.0f}, {screen['Y']:.0f})")
+    print(f"Found {len(windows)} Ghostty windows")
 
-    if not app:
-        print("❌ Could not find Ghostty application")
+    cols, rows = layout_shape(len(windows), len(screens), cols, rows)
+    if plan_cache:
+        cells = plan_cache.cells(screens, len(windows), cols, rows, gap, top_margin)
+        plan_cache.save()
+    else:
+        cells = grid_cells(screens, len(windows), cols, rows, gap, top_margin)
+    moves = plan_layout(windows, cells, tolerance)
+
+    if len(windows) > len(cells):
+        print(f"  Warning: {len(windows) - len(cells)} windows do not fit the grid")
+    print(f"{len(moves)} of {len(windows)} windows need to move")
+
+    by_number = {window['number']: window for window in windows}
+    for move in moves:
+        print(f"Positioning window {move.index} ({by_number[move.number]['name']})"
+              f" at ({move.x:.0f}, {move.y:.0f}) size {move.width:.0f}x{move.height:.0f}")
+
+    try:
+        backend.apply_moves(moves)
+    except Exception as e:
+        print(f"  Warning: Could not position windows: {e}")
         return False
 
-    app = app[0]
-    app.activateWithOptions_(AppKit.NSApplicationActivateIgnoringOtherApps)
-    time.sleep(0.5)
-
-    # Try to position windows using AppleScript as fallback
-    for i, (window, (row, col)) in enumerate(zip(windows[:6], grid_positions)):
-        window_x = col * (window_width + gap)
-        window_y = top_margin + row * (window_height + gap)
-
-        print(f"Positioning window {i+1} ({window['name']}) at ({window_x:.0f}, {window_y:.0f})")
-
-        # Use osascript to move the window
-        script = f'''
-tell application "System Events"
-    tell process "ghostty"
-        try
-            set position of window {i+1} to {{{int(window_x)}, {int(window_y)}}}
-            set size of window {i+1} to {{{int(window_width)}, {int(window_height)}}}
-        on error errMsg
-            log "Error moving window {i+1}: " & errMsg
-        end try
-    end tell
-end tell
-'''
-        import subprocess
-        try:
-            subprocess.run(['osascript', '-e', script], capture_output=True, timeout=2)
-        except Exception as e:
-            print(f"  Warning: Could not position window {i+1}: {e}")
-
     return True
 
-def main():
-    windows = get_ghostty_windows()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Tile Ghostty windows in a grid')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=default_backend_name())
+    parser.add_argument('--cols', type=int,
+                        help='columns per screen (default: 3, or derived from --rows)')
+    parser.add_argument('--rows', type=int,
+                        help='rows per screen (default: 2, more once windows do not fit)')
+    parser.add_argument('--gap', type=int, default=10)
+    parser.add_argument('--top-margin', type=int, default=60)
+    parser.add_argument('--screens', type=int, default=1,
+                        help='number of screens to tile across, main first (0 = all)')
+    parser.add_argument('--tolerance', type=int, default=4,
+                        help='pixels a window may be off its cell without moving')
+    parser.add_argument('--daemon', action='store_true',
+                        help='keep running and re-tile whenever windows change')
+    parser.add_argument('--poll-interval', type=float, default=1.0,
+                        help='seconds between window listings when the backend has no events')
+    parser.add_argument('--index-file', default=DEFAULT_INDEX_PATH,
+                        help='where the daemon saves its window index')
+    parser.add_argument('--from-index', action='store_true',
+                        help="tile from the daemon's saved window index")
+    parser.add_argument('--plan-cache', default=DEFAULT_PLAN_CACHE_PATH,
+                        help='where computed layouts are cached')
+    parser.add_argument('--no-plan-cache', action='store_true')
+    parser.add_argument('--fast', action='store_true',
+                        help='reuse the last known screens and skip PyObjC (for hotkeys)')
+    args = parser.parse_args(argv)
+
+    backend_options = {}
+    if args.fast and args.backend == 'applescript':
+        backend_options['window_source'] = 'system-events'
+
+    try:
+        backend = get_backend(args.backend, **backend_options)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if args.daemon:
+        return run_daemon(backend, args)
+
+    try:
+        windows = get_ghostty_windows(backend, args.index_file if args.from_index else None)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
 
     if not windows:
         print("No Ghostty windows found")
         return 1
 
-    success = position_windows_grid(windows)
+    plan_cache = None if args.no_plan_cache else LayoutPlanCache(args.plan_cache)
+
+    try:
+        success = position_windows_grid(
+            windows, backend, args.cols, args.rows, args.gap, args.top_margin,
+            args.screens, args.tolerance, plan_cache, args.fast,
+        )
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
 
     if success:
         print("\n✅ Window grid layout complete!")
-        print("\nGrid layout:")
-        print("┌─────────────┬─────────────┬─────────────┐")
-        print("│   CHRONOS   │ IMAGINARIUM │ ARCHITECTUS │")
-        print("├─────────────┼─────────────┼─────────────┤")
-        print("│    LUDUS    │   OCULUS    │  OPERATUS   │")
-        print("└─────────────┴─────────────┴─────────────┘")
+        if args.screens == 1 and layout_shape(len(windows), 1, args.cols, args.rows) == (3, 2):
+            print("\nGrid layout:")
+            print("┌─────────────┬─────────────┬─────────────┐")
+            print("│   CHRONOS   │ IMAGINARIUM │ ARCHITECTUS │")
+            print("├─────────────┼─────────────┼─────────────┤")
+            print("│    LUDUS    │   OCULUS    │  OPERATUS   │")
+            print("└─────────────┴─────────────┴─────────────┘")
         return 0
     else:
         return 1
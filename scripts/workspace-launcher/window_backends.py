@@ -0,0 +1,515 @@
+"""
+Window backends for ghostty-window-grid.py
+
+A backend finds Ghostty windows and applies a whole layout in one
+transaction, instead of one IPC round trip per window:
+
+    list_windows()      -> [{'number', 'name', 'bounds', 'pid'}, ...]
+    screens()           -> [{'X', 'Y', 'Width', 'Height'}, ...]  main screen first
+    apply_moves(moves)  -> moves every window in a single batch
+
+Backends with supports_events also report window changes, so a daemon
+does not have to re-list every window to notice them:
+
+    wait_for_events(timeout) -> [WindowEvent, ...], [] on timeout
+
+Bounds and screen frames use kCGWindowBounds conventions: a dict of
+X/Y/Width/Height in global coordinates with the origin at the top left.
+
+A backend that learns the bounds of the whole desktop (all screens) for
+free while listing windows sets desktop_bounds, so callers holding
+cached screen frames can tell when the screens changed.
+
+Backends:
+    applescript  macOS: Quartz (or System Events) to list windows,
+                 one osascript per layout
+    x11          Linux: EWMH via python-xlib, one flush per layout
+    fake         in-memory, records calls and simulates IPC latency
+
+Platform modules (PyObjC, python-xlib) are imported on first use rather
+than at module load; importing Quartz/AppKit/Foundation alone costs more
+than the rest of a re-tile.
+"""
+
+import importlib.util
+import queue
+import select
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+# Set by _import_pyobjc() / _import_xlib()
+Quartz = None
+AppKit = None
+X = None
+xdisplay = None
+xevent = None
+
+
+def _import_pyobjc():
+    global Quartz, AppKit
+    if Quartz is None:
+        try:
+            import Quartz as quartz_module
+            import AppKit as appkit_module
+        except ImportError as e:
+            raise RuntimeError('PyObjC (Quartz/AppKit) is required for this operation') from e
+        Quartz, AppKit = quartz_module, appkit_module
+
+
+def _import_xlib():
+    global X, xdisplay, xevent
+    if xdisplay is None:
+        try:
+            from Xlib import X as x_module, display as display_module
+            from Xlib.protocol import event as event_module
+        except ImportError as e:
+            raise RuntimeError(
+                'python-xlib is required for the x11 backend (pip3 install python-xlib)'
+            ) from e
+        X, xdisplay, xevent = x_module, display_module, event_module
+
+
+def _module_available(name):
+    """Whether a module can be imported, without importing it"""
+    return importlib.util.find_spec(name) is not None
+
+# index: 1-based position in list_windows() order (AppleScript addresses
+# windows this way); number: the backend's window id
+WindowMove = namedtuple('WindowMove', ['index', 'number', 'x', 'y', 'width', 'height'])
+
+# kind: 'created', 'destroyed' or 'moved'; window: the window dict as
+# list_windows() returns it (its last known state for 'destroyed')
+WindowEvent = namedtuple('WindowEvent', ['kind', 'window'])
+
+
+def make_bounds(x, y, width, height):
+    return {'X': x, 'Y': y, 'Width': width, 'Height': height}
+
+
+class WindowBackend:
+    """Interface shared by all window backends"""
+
+    name = None
+    supports_events = False
+    # Set by list_windows() when known: union of every screen frame
+    desktop_bounds = None
+
+    def list_windows(self):
+        raise NotImplementedError
+
+    def screens(self):
+        raise NotImplementedError
+
+    def apply_moves(self, moves):
+        raise NotImplementedError
+
+    def wait_for_events(self, timeout):
+        raise NotImplementedError
+
+
+class AppleScriptBackend(WindowBackend):
+    """
+    Quartz window server for listing, System Events for moving
+
+    window_source='system-events' lists windows through osascript too, so
+    a re-tile never loads PyObjC; window numbers are then the System
+    Events window indexes rather than window server ids.
+    """
+
+    name = 'applescript'
+
+    # First line: Ghostty's pid, then the desktop bounds (left, top,
+    # right, bottom across all screens) when Finder can report them
+    LIST_WINDOWS_SCRIPT = '''
+set desktop to ""
+try
+    tell application "Finder" to set {l, t, r, b} to bounds of window of desktop
+    set desktop to tab & l & tab & t & tab & r & tab & b
+end try
+tell application "System Events"
+    tell process "ghostty"
+        set output to (unix id as text) & desktop & linefeed
+        repeat with w in windows
+            set {x, y} to position of w
+            set {wd, ht} to size of w
+            set output to output & (name of w) & tab & x & tab & y & tab & wd & tab & ht & linefeed
+        end repeat
+        return output
+    end tell
+end tell
+'''
+
+    def __init__(self, timeout=5, window_source='quartz'):
+        if window_source not in ('quartz', 'system-events'):
+            raise ValueError(f"Unknown window source: {window_source}")
+        if window_source == 'quartz' and not _module_available('Quartz'):
+            raise RuntimeError('PyObjC (Quartz/AppKit) is required for the applescript backend')
+        self.timeout = timeout
+        self.window_source = window_source
+
+    def list_windows(self):
+        if self.window_source == 'system-events':
+            return self._list_windows_system_events()
+        return self._list_windows_quartz()
+
+    def _list_windows_system_events(self):
+        """Get all Ghostty windows with a single System Events query"""
+        result = subprocess.run(
+            ['osascript', '-'],
+            input=self.LIST_WINDOWS_SCRIPT,
+            capture_output=True,
+            text=True,
+            timeout=self.timeout,
+        )
+        if result.returncode != 0:
+            return []
+
+        lines = result.stdout.strip('\n').split('\n')
+        header = lines[0].split('\t') if lines else []
+        pid = int(header[0]) if header and header[0].isdigit() else None
+        self.desktop_bounds = None
+        if len(header) == 5:
+            left, top, right, bottom = (float(value) for value in header[1:])
+            self.desktop_bounds = make_bounds(left, top, right - left, bottom - top)
+        windows = []
+        for i, line in enumerate(lines[1:], 1):
+            name, x, y, width, height = line.rsplit('\t', 4)
+            windows.append({
+                'number': i,
+                'name': name or 'Untitled',
+                'bounds': make_bounds(float(x), float(y), float(width), float(height)),
+                'pid': pid,
+            })
+        return windows
+
+    def _list_windows_quartz(self):
+        """Get all Ghostty windows using Quartz window server"""
+        _import_pyobjc()
+        window_list = Quartz.CGWindowListCopyWindowInfo(
+            Quartz.kCGWindowListOptionOnScreenOnly | Quartz.kCGWindowListExcludeDesktopElements,
+            Quartz.kCGNullWindowID
+        )
+
+        ghostty_windows = []
+        for window in window_list:
+            owner_name = window.get(Quartz.kCGWindowOwnerName, '')
+            window_layer = window.get(Quartz.kCGWindowLayer, -1)
+            window_name = window.get(Quartz.kCGWindowName, 'Untitled')
+
+            # Find Ghostty windows (standard windows on layer 0)
+            if owner_name.lower() == 'ghostty' and window_layer == 0:
+                window_number = window.get(Quartz.kCGWindowNumber)
+                bounds = window.get(Quartz.kCGWindowBounds)
+                ghostty_windows.append({
+                    'number': window_number,
+                    'name': window_name,
+                    'bounds': dict(bounds),
+                    'pid': window.get(Quartz.kCGWindowOwnerPID)
+                })
+
+        return ghostty_windows
+
+    def screens(self):
+        """Screen frames, flipped from AppKit's bottom-left origin"""
+        _import_pyobjc()
+        ns_screens = AppKit.NSScreen.screens()
+        main_height = ns_screens[0].frame().size.height
+        frames = []
+        for screen in ns_screens:
+            frame = screen.frame()
+            frames.append(make_bounds(
+                frame.origin.x,
+                main_height - frame.origin.y - frame.size.height,
+                frame.size.width,
+                frame.size.height,
+            ))
+        return frames
+
+    def build_script(self, moves):
+        """One AppleScript that activates Ghostty and applies every move"""
+        lines = [
+            'tell application "System Events"',
+            '    tell process "ghostty"',
+            '        set frontmost to true',
+        ]
+        for move in moves:
+            lines += [
+                '        try',
+                f'            set position of window {move.index} to {{{int(move.x)}, {int(move.y)}}}',
+                f'            set size of window {move.index} to {{{int(move.width)}, {int(move.height)}}}',
+                '        on error errMsg',
+                f'            log "Error moving window {move.index}: " & errMsg',
+                '        end try',
+            ]
+        lines += [
+            '    end tell',
+            'end tell',
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def apply_moves(self, moves):
+        if not moves:
+            return
+        result = subprocess.run(
+            ['osascript', '-'],
+            input=self.build_script(moves),
+            capture_output=True,
+            text=True,
+            timeout=self.timeout,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f'osascript failed ({result.returncode}): {result.stderr.strip()}')
+
+
+class X11Backend(WindowBackend):
+    """EWMH window manager hints via python-xlib"""
+
+    name = 'x11'
+    supports_events = True
+
+    # _NET_MOVERESIZE_WINDOW flags: static gravity, x/y/width/height set,
+    # source indication 2 (pager/tiler)
+    MOVERESIZE_FLAGS = 10 | (0xF << 8) | (2 << 12)
+
+    def __init__(self, display_name=None):
+        _import_xlib()
+        try:
+            self.display = xdisplay.Display(display_name)
+        except Exception as e:
+            raise RuntimeError(f'Could not open X display: {e}') from e
+        self.root = self.display.screen().root
+        self._atoms = {}
+        self._known = None
+
+    def atom(self, name):
+        if name not in self._atoms:
+            self._atoms[name] = self.display.intern_atom(name)
+        return self._atoms[name]
+
+    def _property(self, window, name):
+        prop = window.get_full_property(self.atom(name), X.AnyPropertyType)
+        return prop.value if prop is not None else None
+
+    def _window_info(self, window_id):
+        window = self.display.create_resource_object('window', window_id)
+        wm_class = window.get_wm_class() or ()
+        if not any('ghostty' in part.lower() for part in wm_class):
+            return None
+
+        title = self._property(window, '_NET_WM_NAME')
+        if isinstance(title, bytes):
+            title = title.decode('utf-8', 'replace')
+        pid = self._property(window, '_NET_WM_PID')
+
+        geometry = window.get_geometry()
+        origin = window.translate_coords(self.root, 0, 0)
+        return {
+            'number': window_id,
+            'name': title or window.get_wm_name() or 'Untitled',
+            'bounds': make_bounds(-origin.x, -origin.y, geometry.width, geometry.height),
+            'pid': pid[0] if pid is not None else None,
+        }
+
+    def list_windows(self):
+        client_ids = self._property(self.root, '_NET_CLIENT_LIST') or []
+        windows = []
+        for window_id in client_ids:
+            try:
+                info = self._window_info(window_id)
+            except Exception:
+                continue  # destroyed since the client list was read
+            if info is not None:
+                windows.append(info)
+        return windows
+
+    def screens(self):
+        try:
+            monitors = self.display.xrandr_get_monitors(self.root).monitors
+        except Exception:
+            monitors = []
+        if not monitors:
+            geometry = self.root.get_geometry()
+            return [make_bounds(0, 0, geometry.width, geometry.height)]
+        monitors = sorted(monitors, key=lambda m: not m.primary)
+        return [make_bounds(m.x, m.y, m.width_in_pixels, m.height_in_pixels) for m in monitors]
+
+    def apply_moves(self, moves):
+        if not moves:
+            return
+        message_type = self.atom('_NET_MOVERESIZE_WINDOW')
+        mask = X.SubstructureRedirectMask | X.SubstructureNotifyMask
+        for move in moves:
+            window = self.display.create_resource_object('window', move.number)
+            message = xevent.ClientMessage(
+                window=window,
+                client_type=message_type,
+                data=(32, [
+                    self.MOVERESIZE_FLAGS,
+                    int(move.x), int(move.y), int(move.width), int(move.height),
+                ]),
+            )
+            self.root.send_event(message, event_mask=mask)
+        # All requests go out in a single round trip
+        self.display.flush()
+
+    def _track(self, window_id):
+        window = self.display.create_resource_object('window', window_id)
+        window.change_attributes(event_mask=X.StructureNotifyMask)
+
+    def _start_watching(self):
+        self.root.change_attributes(event_mask=X.PropertyChangeMask)
+        self._known = {w['number']: w for w in self.list_windows()}
+        for window_id in self._known:
+            self._track(window_id)
+        self.display.flush()
+
+    def wait_for_events(self, timeout):
+        """
+        Window changes from _NET_CLIENT_LIST property changes on the root
+        window and ConfigureNotify on each tracked Ghostty window
+        """
+        if self._known is None:
+            self._start_watching()
+
+        if not self.display.pending_events():
+            ready, _, _ = select.select([self.display], [], [], timeout)
+            if not ready:
+                return []
+
+        client_list_changed = False
+        configured = set()
+        while self.display.pending_events():
+            event = self.display.next_event()
+            if event.type == X.PropertyNotify and event.atom == self.atom('_NET_CLIENT_LIST'):
+                client_list_changed = True
+            elif event.type == X.ConfigureNotify:
+                configured.add(event.window.id)
+
+        events = []
+        if client_list_changed:
+            current = {w['number']: w for w in self.list_windows()}
+            for window_id in current.keys() - self._known.keys():
+                try:
+                    self._track(window_id)
+                except Exception:
+                    continue
+                events.append(WindowEvent('created', current[window_id]))
+            for window_id in self._known.keys() - current.keys():
+                events.append(WindowEvent('destroyed', self._known[window_id]))
+            self._known = current
+            self.display.flush()
+
+        for window_id in configured & self._known.keys():
+            try:
+                info = self._window_info(window_id)
+            except Exception:
+                continue  # destroyed since the event was queued
+            if info is not None:
+                self._known[window_id] = info
+                events.append(WindowEvent('moved', info))
+
+        return events
+
+
+class FakeBackend(WindowBackend):
+    """
+    In-memory backend for tests and benchmarks
+
+    Records every call in `calls` and sleeps to simulate IPC: each
+    apply_moves() costs transaction_latency plus move_latency per move.
+    add_window(), close_window(), move_window() and apply_moves() queue
+    WindowEvents, which may be driven from another thread.
+    """
+
+    name = 'fake'
+    supports_events = True
+
+    def __init__(self, windows=None, screens=None, transaction_latency=0.0, move_latency=0.0):
+        self.windows = [dict(w, bounds=dict(w['bounds'])) for w in (windows or [])]
+        self._screens = screens or [make_bounds(0, 0, 1920, 1080)]
+        self.transaction_latency = transaction_latency
+        self.move_latency = move_latency
+        self.calls = []
+        self.events = queue.Queue()
+        self._next_number = max((w['number'] for w in self.windows), default=0) + 1
+
+    def add_window(self, name, bounds=None, pid=1000):
+        window = {
+            'number': self._next_number,
+            'name': name,
+            'bounds': dict(bounds or make_bounds(0, 0, 800, 600)),
+            'pid': pid,
+        }
+        self._next_number += 1
+        self.windows.append(window)
+        self.events.put(WindowEvent('created', dict(window)))
+        return window
+
+    def close_window(self, number):
+        for window in self.windows:
+            if window['number'] == number:
+                self.windows.remove(window)
+                self.events.put(WindowEvent('destroyed', dict(window)))
+                return
+
+    def move_window(self, number, bounds):
+        """Simulate the user dragging a window"""
+        for window in self.windows:
+            if window['number'] == number:
+                window['bounds'] = dict(bounds)
+                self.events.put(WindowEvent('moved', dict(window, bounds=dict(bounds))))
+                return
+
+    def list_windows(self):
+        self.calls.append(('list_windows',))
+        return [dict(w, bounds=dict(w['bounds'])) for w in self.windows]
+
+    def screens(self):
+        self.calls.append(('screens',))
+        return [dict(s) for s in self._screens]
+
+    def apply_moves(self, moves):
+        moves = list(moves)
+        self.calls.append(('apply_moves', moves))
+        latency = self.transaction_latency + self.move_latency * len(moves)
+        if latency:
+            time.sleep(latency)
+        by_number = {w['number']: w for w in self.windows}
+        for move in moves:
+            window = by_number.get(move.number)
+            if window is not None:
+                window['bounds'] = make_bounds(move.x, move.y, move.width, move.height)
+                self.events.put(WindowEvent('moved', dict(window, bounds=dict(window['bounds']))))
+
+    def wait_for_events(self, timeout):
+        self.calls.append(('wait_for_events', timeout))
+        try:
+            events = [self.events.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+
+BACKENDS = {
+    'applescript': AppleScriptBackend,
+    'x11': X11Backend,
+    'fake': FakeBackend,
+}
+
+
+def default_backend_name():
+    return 'applescript' if sys.platform == 'darwin' else 'x11'
+
+
+def get_backend(name=None, **kwargs):
+    """Instantiate a backend by name (default: the platform's native one)"""
+    name = name or default_backend_name()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown window backend: {name} (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name](**kwargs)
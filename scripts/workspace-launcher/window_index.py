@@ -0,0 +1,254 @@
+"""
+Indexed view of Ghostty windows, kept current by a daemon
+
+WindowIndex holds the Ghostty windows by window number, pid and pillar
+title. WindowDaemon keeps it current from backend events (window
+created / destroyed / moved) where the backend supports them, and by
+re-listing windows every `poll_interval` seconds otherwise. With events,
+a full re-list still runs every `resync_interval` seconds in case an
+event was missed. Whenever the index changes, the daemon re-tiles.
+
+The window manager may adjust a move (size hints, decorations), so a
+window can settle outside its cell. The daemon remembers where each
+window settled after its last move and does not re-issue the same move
+while the window stays there; otherwise every echo would re-tile again.
+
+The index can be saved as JSON, so a separate tiler process can read
+the window list without asking the window server for every window. The
+daemon rewrites it after every re-tile and every re-list, so its age
+never exceeds `resync_interval` (or `poll_interval`) by much:
+
+    python3 ghostty-window-grid.py --daemon
+    python3 ghostty-window-grid.py --from-index
+"""
+
+import json
+import os
+import time
+
+from window_backends import make_bounds
+from window_layout import grid_cells, layout_shape, plan_layout
+
+PILLARS = ('CHRONOS', 'IMAGINARIUM', 'ARCHITECTUS', 'LUDUS', 'OCULUS', 'OPERATUS')
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'dendrovia', 'ghostty-windows.json'
+)
+
+
+def pillar_for_title(title):
+    """The pillar named in a window title, if any"""
+    upper = (title or '').upper()
+    for pillar in PILLARS:
+        if pillar in upper:
+            return pillar
+    return None
+
+
+class WindowIndex:
+    """Ghostty windows indexed by number, pid and pillar title"""
+
+    def __init__(self, windows=()):
+        self._by_number = {}
+        self.replace(windows)
+
+    def __len__(self):
+        return len(self._by_number)
+
+    def replace(self, windows):
+        """Reset from a full window listing; returns True if anything changed"""
+        by_number = {}
+        for i, window in enumerate(windows):
+            by_number[window['number']] = dict(window, index=i + 1)
+        changed = self._snapshot(self._by_number) != self._snapshot(by_number)
+        self._by_number = by_number
+        return changed
+
+    def apply(self, event):
+        """Apply a WindowEvent; returns True if the index changed"""
+        number = event.window['number']
+        if event.kind == 'destroyed':
+            return self._by_number.pop(number, None) is not None
+
+        current = self._by_number.get(number)
+        updated = dict(event.window)
+        if current is not None:
+            updated.setdefault('index', current.get('index'))
+        else:
+            updated.setdefault('index', len(self._by_number) + 1)
+        self._by_number[number] = updated
+        return current is None or current['bounds'] != updated['bounds'] \
+            or current['name'] != updated['name']
+
+    def update_bounds(self, number, bounds):
+        window = self._by_number.get(number)
+        if window is not None:
+            window['bounds'] = dict(bounds)
+
+    @staticmethod
+    def _snapshot(by_number):
+        # index is the window's position in the listing (z-order for
+        # AppleScript, which addresses windows by it), so it counts too
+        return {
+            number: (window['name'], window.get('index'), tuple(sorted(window['bounds'].items())))
+            for number, window in by_number.items()
+        }
+
+    def by_number(self, number):
+        return self._by_number.get(number)
+
+    def by_pid(self, pid):
+        return [w for w in self._by_number.values() if w['pid'] == pid]
+
+    def by_pillar(self, pillar):
+        for window in self.windows():
+            if pillar_for_title(window['name']) == pillar.upper():
+                return window
+        return None
+
+    def windows(self):
+        """Windows in layout order: pillars in PILLARS order, then by number"""
+        def order(window):
+            pillar = pillar_for_title(window['name'])
+            rank = PILLARS.index(pillar) if pillar else len(PILLARS)
+            return rank, window['number']
+        return sorted(self._by_number.values(), key=order)
+
+    def save(self, path=DEFAULT_INDEX_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'updated': time.time(), 'windows': self.windows()}, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH):
+        """Load a saved index; returns (index, seconds since it was saved)"""
+        with open(path) as f:
+            data = json.load(f)
+        index = cls()
+        index._by_number = {w['number']: w for w in data['windows']}
+        return index, time.time() - data['updated']
+
+
+class WindowDaemon:
+    """Keeps a WindowIndex current and re-tiles whenever it changes"""
+
+    def __init__(self, backend, layout=None, poll_interval=1.0, resync_interval=30.0,
+                 index_path=None, on_change=None, settle_time=0.5):
+        """
+        layout: grid_cells() keyword arguments (cols, rows, gap, top_margin,
+        plus screen_count and tolerance); on_change(index, moves) is called
+        after every re-tile. Bounds reported within settle_time seconds of a
+        move (and the first report after it) count as the move's result.
+        """
+        self.backend = backend
+        self.layout = dict(layout or {})
+        self.poll_interval = poll_interval
+        self.resync_interval = resync_interval
+        self.index_path = index_path
+        self.on_change = on_change
+        self.settle_time = settle_time
+        self.index = WindowIndex()
+        # window number -> last move issued: target cell, time, settled bounds
+        self._issued = {}
+        self._running = False
+        self._last_resync = 0.0
+
+    def resync(self):
+        self._last_resync = time.monotonic()
+        windows = self.backend.list_windows()
+        for window in windows:
+            self._note_bounds(window)
+        current = {window['number'] for window in windows}
+        for number in self._issued.keys() - current:
+            del self._issued[number]
+        changed = self.index.replace(windows)
+        # A change is saved by the re-tile that follows; otherwise refresh
+        # the saved index so readers know it is still current
+        if self.index_path and not changed:
+            self.index.save(self.index_path)
+        return changed
+
+    def _note_bounds(self, window):
+        """Record where a window settled after the daemon last moved it"""
+        issued = self._issued.get(window['number'])
+        if issued is None:
+            return
+        if not issued['confirmed'] or time.monotonic() - issued['at'] <= self.settle_time:
+            issued['settled'] = dict(window['bounds'])
+            issued['confirmed'] = True
+
+    def _is_repeat(self, move):
+        """True if move re-issues the last move for a window that has not moved since"""
+        issued = self._issued.get(move.number)
+        window = self.index.by_number(move.number)
+        return (
+            issued is not None and window is not None
+            and issued['cell'] == make_bounds(move.x, move.y, move.width, move.height)
+            and window['bounds'] == issued['settled']
+        )
+
+    def retile(self):
+        layout = dict(self.layout)
+        screen_count = layout.pop('screen_count', 1)
+        tolerance = layout.pop('tolerance', 4)
+
+        screens = self.backend.screens()
+        if screen_count:
+            screens = screens[:screen_count]
+
+        windows = self.index.windows()
+        layout['cols'], layout['rows'] = layout_shape(
+            len(windows), len(screens), layout.get('cols'), layout.get('rows')
+        )
+        moves = plan_layout(windows, grid_cells(screens, len(windows), **layout), tolerance)
+        moves = [move for move in moves if not self._is_repeat(move)]
+        if moves:
+            self.backend.apply_moves(moves)
+            # Record the new bounds now, so the backend's echo of these
+            # moves does not count as a change
+            now = time.monotonic()
+            for move in moves:
+                cell = make_bounds(move.x, move.y, move.width, move.height)
+                self.index.update_bounds(move.number, cell)
+                self._issued[move.number] = {
+                    'cell': cell, 'at': now, 'settled': dict(cell), 'confirmed': False,
+                }
+        if self.index_path:
+            self.index.save(self.index_path)
+        if self.on_change:
+            self.on_change(self.index, moves)
+        return moves
+
+    def step(self):
+        """Wait for the next change (or interval) and re-tile if needed"""
+        if self.backend.supports_events:
+            timeout = max(0.0, self._last_resync + self.resync_interval - time.monotonic())
+            events = self.backend.wait_for_events(timeout)
+            changed = False
+            for event in events:
+                if event.kind == 'destroyed':
+                    self._issued.pop(event.window['number'], None)
+                else:
+                    self._note_bounds(event.window)
+                changed |= self.index.apply(event)
+            if not events:
+                changed = self.resync()
+        else:
+            time.sleep(self.poll_interval)
+            changed = self.resync()
+
+        if changed:
+            return self.retile()
+        return None
+
+    def run(self):
+        self._running = True
+        self.resync()
+        self.retile()
+        while self._running:
+            self.step()
+
+    def stop(self):
+        self._running = False
@@ -0,0 +1,266 @@
+"""
+Layout planning for ghostty-window-grid.py
+
+Turns screens and a window count into grid cells, then diffs the cells
+against each window's current bounds so only misplaced windows move:
+
+    screens = backend.screens()
+    cols, rows = layout_shape(len(windows), len(screens))
+    cells = grid_cells(screens, len(windows), cols, rows)
+    moves = plan_layout(windows, cells, tolerance=4)
+    backend.apply_moves(moves)
+
+Windows already sitting in a cell (within `tolerance` pixels) keep it;
+the rest fill the free cells in order. While the grid shape is stable,
+opening a window therefore moves only that window, and closing one
+leaves its neighbours where they are. layout_shape() keeps the default
+3 x 2 grid until the windows no longer fit, so the shape only changes
+when it has to.
+
+LayoutPlanCache stores computed cells on disk, keyed by screen frames,
+grid shape, gap, top margin and the window count (or, for a fixed grid,
+the number of screens it fills), together with the last screen setup
+seen, so a hotkey re-tile on a known monitor setup can skip both the
+screen query and the layout math.
+"""
+
+import json
+import math
+import os
+
+from window_backends import WindowMove, make_bounds
+
+DEFAULT_PLAN_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'dendrovia', 'window-grid-plans.json'
+)
+
+DEFAULT_COLS = 3
+DEFAULT_ROWS = 2
+
+
+def grid_shape(count, cols=None, rows=None):
+    """(cols, rows) for count windows; missing dimensions are derived"""
+    count = max(count, 1)
+    if cols and rows:
+        return cols, rows
+    if cols:
+        return cols, math.ceil(count / cols)
+    if rows:
+        return math.ceil(count / rows), rows
+    cols = math.ceil(math.sqrt(count))
+    return cols, math.ceil(count / cols)
+
+
+def layout_shape(count, screen_count=1, cols=None, rows=None):
+    """
+    (cols, rows) per screen to pass to grid_cells()
+
+    Explicit cols/rows are returned unchanged. Without either, the
+    DEFAULT_COLS x DEFAULT_ROWS grid is used, with rows added only once
+    count windows no longer fit on screen_count screens.
+    """
+    if cols or rows:
+        return cols, rows
+    per_row = DEFAULT_COLS * max(screen_count, 1)
+    return DEFAULT_COLS, max(DEFAULT_ROWS, math.ceil(count / per_row))
+
+
+def screen_cells(screen, cols, rows, gap=10, top_margin=60):
+    """Cell bounds of a cols x rows grid on one screen, row-major"""
+    # Calculate usable area
+    usable_width = screen['Width']
+    usable_height = screen['Height'] - top_margin
+
+    # Calculate window dimensions
+    window_width = (usable_width - gap * (cols - 1)) / cols
+    window_height = (usable_height - gap * (rows - 1)) / rows
+
+    return [
+        make_bounds(
+            screen['X'] + col * (window_width + gap),
+            screen['Y'] + top_margin + row * (window_height + gap),
+            window_width,
+            window_height,
+        )
+        for row in range(rows)
+        for col in range(cols)
+    ]
+
+
+def grid_cells(screens, count, cols=None, rows=None, gap=10, top_margin=60):
+    """
+    Cells for count windows across screens
+
+    With both cols and rows given, each screen holds a full cols x rows
+    grid and screens fill in order. Otherwise windows are split evenly
+    across screens and each screen's grid shape is derived. Spare cells
+    in a partly filled grid are kept, so a closed window leaves a hole
+    rather than reshuffling its neighbours.
+    """
+    if not screens or count <= 0:
+        return []
+
+    if cols and rows:
+        per_screen = [cols * rows] * len(screens)
+    else:
+        base, extra = divmod(count, len(screens))
+        per_screen = [base + (i < extra) for i in range(len(screens))]
+
+    cells = []
+    spare = []
+    for screen, screen_count in zip(screens, per_screen):
+        if screen_count == 0 or len(cells) >= count:
+            continue
+        screen_cols, screen_rows = grid_shape(screen_count, cols, rows)
+        grid = screen_cells(screen, screen_cols, screen_rows, gap, top_margin)
+        cells.extend(grid[:screen_count])
+        spare.extend(grid[screen_count:])
+    return cells + spare
+
+
+def screens_bounds(screens):
+    """The smallest frame containing every screen"""
+    left = min(s['X'] for s in screens)
+    top = min(s['Y'] for s in screens)
+    right = max(s['X'] + s['Width'] for s in screens)
+    bottom = max(s['Y'] + s['Height'] for s in screens)
+    return make_bounds(left, top, right - left, bottom - top)
+
+
+def within_tolerance(bounds, cell, tolerance):
+    """True when bounds matches cell to within tolerance pixels on every edge"""
+    return all(
+        abs(bounds[key] - cell[key]) <= tolerance
+        for key in ('X', 'Y', 'Width', 'Height')
+    )
+
+
+def plan_layout(windows, cells, tolerance=4):
+    """
+    Moves needed to put windows into cells
+
+    windows are in backend listing order; a window's 'index' key, when
+    present, overrides its 1-based listing position.
+    """
+    free_cells = list(range(len(cells)))
+    placed = {}
+
+    # Windows already in a cell keep it
+    for i, window in enumerate(windows):
+        for cell_index in free_cells:
+            if within_tolerance(window['bounds'], cells[cell_index], tolerance):
+                placed[i] = cell_index
+                free_cells.remove(cell_index)
+                break
+
+    moves = []
+    for i, window in enumerate(windows):
+        if i in placed:
+            continue
+        if not free_cells:
+            break
+        cell = cells[free_cells.pop(0)]
+        moves.append(WindowMove(
+            index=window.get('index', i + 1),
+            number=window['number'],
+            x=cell['X'],
+            y=cell['Y'],
+            width=cell['Width'],
+            height=cell['Height'],
+        ))
+    return moves
+
+
+class LayoutPlanCache:
+    """grid_cells() results cached in a JSON file"""
+
+    MAX_PLANS = 32
+
+    def __init__(self, path=DEFAULT_PLAN_CACHE_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._data = None
+        self._dirty = False
+
+    def _load(self):
+        if self._data is None:
+            try:
+                with open(self.path) as f:
+                    self._data = json.load(f)
+                if not isinstance(self._data.get('plans'), dict):
+                    raise ValueError('malformed plan cache')
+            except (OSError, ValueError, AttributeError):
+                self._data = {'plans': {}, 'last_screens': None}
+        return self._data
+
+    @staticmethod
+    def key(screens, count, cols, rows, gap, top_margin):
+        # A fixed grid depends on the count only through how many screens
+        # it fills; a derived grid depends on the count itself
+        if cols and rows:
+            count_key = ['screens', min(len(screens), math.ceil(count / (cols * rows)))]
+        else:
+            count_key = ['count', count]
+        frames = [[s['X'], s['Y'], s['Width'], s['Height']] for s in screens]
+        return json.dumps([frames, cols, rows, count_key, gap, top_margin])
+
+    def cells(self, screens, count, cols=None, rows=None, gap=10, top_margin=60):
+        """Cached equivalent of grid_cells()"""
+        plans = self._load()['plans']
+        key = self.key(screens, count, cols, rows, gap, top_margin)
+
+        cells = plans.get(key)
+        if cells is not None:
+            self.hits += 1
+            if next(reversed(plans)) != key:
+                # Most recently used last, saved so eviction stays least
+                # recently used across tiler runs
+                del plans[key]
+                plans[key] = cells
+                self._dirty = True
+            return cells
+
+        self.misses += 1
+        cells = grid_cells(screens, count, cols, rows, gap, top_margin)
+        while len(plans) >= self.MAX_PLANS:
+            plans.pop(next(iter(plans)))
+        plans[key] = cells
+        self._dirty = True
+        return cells
+
+    def last_screens(self):
+        return self._load().get('last_screens')
+
+    @staticmethod
+    def screens_still_valid(screens, windows, desktop_bounds=None):
+        """
+        Whether remembered screens still fit what the backend reports:
+        every window's center lies on one of them and, when the backend
+        knows the desktop bounds, the screens span exactly that area
+        """
+        if desktop_bounds is not None and screens_bounds(screens) != desktop_bounds:
+            return False
+        for window in windows:
+            b = window['bounds']
+            x, y = b['X'] + b['Width'] / 2, b['Y'] + b['Height'] / 2
+            if not any(s['X'] <= x < s['X'] + s['Width'] and s['Y'] <= y < s['Y'] + s['Height']
+                       for s in screens):
+                return False
+        return True
+
+    def remember_screens(self, screens):
+        data = self._load()
+        if data.get('last_screens') != screens:
+            data['last_screens'] = screens
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._data, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False